@@ -41,6 +41,11 @@ DEFAULT_BOUNDING_BOX_COLOR = (0.8, 0.8, 0.8)  # Light gray
 # AI Analysis settings
 AI_MODEL_PATH = os.path.join(ASSETS_DIR, "models")
 CONFIDENCE_THRESHOLD = 0.8
+AI_USE_TENSORRT = True  # Compile Keras models to TensorRT engines on GPU hosts
+TRT_ENGINE_PATH = os.path.join(AI_MODEL_PATH, "trt")
+TRT_PRECISION = "FP16"  # "FP32", "FP16" or "INT8"
+TRT_PROFILE_BATCH_SIZES = (1, 8, 32)  # min, opt and max batch of the engine's shape profile
+AI_CPU_BF16 = True  # bfloat16 auto mixed precision via ITEX on CPU-only hosts
 
 # Logging settings
 LOG_LEVEL = "INFO"
@@ -1,58 +1,63 @@
 """
 AI Analysis module for Medical 3D Viewer.
-"""
-
-from .models.architectures import (
-    create_tumor_detection_model,
-    create_segmentation_model,
-    create_landmark_detection_model
-)
-
-from .data.generator import (
-    generate_synthetic_data,
-    generate_segmentation_data,
-    generate_landmark_data
-)
 
-from .utils.training import (
-    train_model,
-    evaluate_model,
-    predict_batch
-)
-
-from .utils.preprocessing import (
-    normalize_image,
-    resize_image,
-    enhance_image,
-    extract_patches,
-    augment_image
-)
+Submodules, and with them TensorFlow, are imported on first use of one of
+the names below, so importing this package is cheap for code paths that
+never run a model.
+"""
 
-from .utils.analysis import analyze_dicom
+import importlib
 
-__all__ = [
+# Public name -> submodule that defines it
+_EXPORTS = {
     # Models
-    'create_tumor_detection_model',
-    'create_segmentation_model',
-    'create_landmark_detection_model',
+    'create_tumor_detection_model': '.models.architectures',
+    'create_segmentation_model': '.models.architectures',
+    'create_landmark_detection_model': '.models.architectures',
     
     # Data Generation
-    'generate_synthetic_data',
-    'generate_segmentation_data',
-    'generate_landmark_data',
+    'generate_synthetic_data': '.data.generator',
+    'generate_segmentation_data': '.data.generator',
+    'generate_landmark_data': '.data.generator',
+    'decode_landmarks': '.data.generator',
     
     # Training
-    'train_model',
-    'evaluate_model',
-    'predict_batch',
+    'train_model': '.utils.training',
+    'evaluate_model': '.utils.training',
+    'predict_batch': '.utils.training',
     
     # Preprocessing
-    'normalize_image',
-    'resize_image',
-    'enhance_image',
-    'extract_patches',
-    'augment_image',
+    'normalize_image': '.utils.preprocessing',
+    'resize_image': '.utils.preprocessing',
+    'enhance_image': '.utils.preprocessing',
+    'extract_patches': '.utils.preprocessing',
+    'augment_image': '.utils.preprocessing',
+    'augment_batch': '.utils.preprocessing',
     
     # Analysis
-    'analyze_dicom'
-] 
\ No newline at end of file
+    'AIAnalysisError': '.utils.analysis',
+    'AIModelManager': '.utils.analysis',
+    'get_model_manager': '.utils.analysis',
+    'release_models': '.utils.analysis',
+    'analyze_dicom': '.utils.analysis',
+    'analyze_volume': '.utils.analysis',
+    'segment_anatomy': '.utils.analysis',
+    'detect_landmarks': '.utils.analysis',
+    
+    # Backend
+    'CPU_BF16_ENABLED': '.utils.backend'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    """Import the submodule defining name on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
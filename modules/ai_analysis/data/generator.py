@@ -3,7 +3,19 @@ Data generation utilities for AI analysis.
 """
 
 import numpy as np
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
+from utils.jit import njit, prange, NUMBA_AVAILABLE
+
+# Shape kinds used by the segmentation rasterizer
+_NO_SHAPE = -1
+_CIRCLE = 0
+_RECTANGLE = 1
+_MAX_SHAPES = 3
+
+def _window_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row and column offsets of every pixel in a (2r+1, 2r+1) window."""
+    grid = np.arange(-radius, radius + 1)
+    return np.repeat(grid, len(grid)), np.tile(grid, len(grid))
 
 def generate_synthetic_data(
     num_samples: int = 1000,
@@ -21,23 +33,27 @@ def generate_synthetic_data(
     Returns:
         Tuple of (X, y) where X is the image data and y is the labels
     """
+    height, width = image_size
+    rng = np.random.default_rng()
+    
     # Create synthetic images (random noise with different patterns)
-    X = np.random.randn(num_samples, *image_size, num_channels)
+    X = rng.standard_normal((num_samples, height, width, num_channels), dtype=np.float32)
     
     # Create synthetic labels (random binary classification)
-    y = np.random.randint(0, 2, num_samples)
-    
-    # Add some patterns to make it more realistic
-    for i in range(num_samples):
-        if y[i] == 1:  # Tumor case
-            # Add a circular pattern
-            center_x = np.random.randint(30, image_size[0]-30)
-            center_y = np.random.randint(30, image_size[1]-30)
-            radius = np.random.randint(5, 15)
-            y_coords, x_coords = np.ogrid[-center_y:image_size[1]-center_y, 
-                                         -center_x:image_size[0]-center_x]
-            mask = x_coords*x_coords + y_coords*y_coords <= radius*radius
-            X[i, mask] = np.random.normal(2, 0.5, mask.sum())
+    y = rng.integers(0, 2, num_samples, dtype=np.int8)
+    
+    # Add a circular pattern to every tumor case in one vectorized pass,
+    # indexing just the pixels of each circle instead of full-image masks
+    pos_idx = np.flatnonzero(y == 1)
+    if len(pos_idx):
+        center_x = rng.integers(30, width-30, size=len(pos_idx))
+        center_y = rng.integers(30, height-30, size=len(pos_idx))
+        radius = rng.integers(5, 15, size=len(pos_idx))
+        
+        oy, ox = _window_offsets(int(radius.max()))
+        sample, k = np.nonzero(oy*oy + ox*ox <= (radius*radius)[:, None])
+        X[pos_idx[sample], center_y[sample] + oy[k], center_x[sample] + ox[k]] = \
+            rng.normal(2, 0.5, (len(k), num_channels))
     
     return X, y
 
@@ -57,47 +73,88 @@ def generate_segmentation_data(
     Returns:
         Tuple of (X, y) where X is the image data and y is the segmentation masks
     """
+    height, width = image_size
+    rng = np.random.default_rng()
+    
     # Create synthetic images
-    X = np.random.randn(num_samples, *image_size, num_channels)
+    X = rng.standard_normal((num_samples, height, width, num_channels), dtype=np.float32)
     
     # Create synthetic masks
-    y = np.zeros((num_samples, *image_size, 1))
+    y = np.zeros((num_samples, height, width, 1), dtype=np.int8)
     
-    # Add random shapes to masks
-    for i in range(num_samples):
-        # Random number of shapes
-        num_shapes = np.random.randint(1, 4)
-        
-        for _ in range(num_shapes):
-            # Random shape type
-            shape_type = np.random.choice(['circle', 'rectangle'])
-            
-            if shape_type == 'circle':
-                # Add circle
-                center_x = np.random.randint(30, image_size[0]-30)
-                center_y = np.random.randint(30, image_size[1]-30)
-                radius = np.random.randint(5, 15)
-                y_coords, x_coords = np.ogrid[-center_y:image_size[1]-center_y, 
-                                             -center_x:image_size[0]-center_x]
-                mask = x_coords*x_coords + y_coords*y_coords <= radius*radius
-                y[i, mask] = 1
-                
-            else:
-                # Add rectangle
-                x1 = np.random.randint(20, image_size[0]-20)
-                y1 = np.random.randint(20, image_size[1]-20)
-                width = np.random.randint(10, 30)
-                height = np.random.randint(10, 30)
-                y[i, y1:y1+height, x1:x1+width] = 1
+    # Pre-sample 1-3 random shapes per mask as rows of (kind, a, b, c, d):
+    # circles are (cx, cy, radius, -) and rectangles are (x1, y1, width, height)
+    shapes = np.empty((num_samples, _MAX_SHAPES, 5), dtype=np.int32)
+    num_shapes = rng.integers(1, _MAX_SHAPES + 1, size=num_samples)
+    is_circle = rng.random((num_samples, _MAX_SHAPES)) < 0.5
+    shapes[..., 0] = np.where(is_circle, _CIRCLE, _RECTANGLE)
+    shapes[np.arange(_MAX_SHAPES)[None, :] >= num_shapes[:, None], 0] = _NO_SHAPE
+    
+    size = (num_samples, _MAX_SHAPES)
+    shapes[..., 1] = np.where(is_circle, rng.integers(30, width-30, size),
+                              rng.integers(20, width-20, size))
+    shapes[..., 2] = np.where(is_circle, rng.integers(30, height-30, size),
+                              rng.integers(20, height-20, size))
+    shapes[..., 3] = np.where(is_circle, rng.integers(5, 15, size),
+                              rng.integers(10, 30, size))
+    shapes[..., 4] = rng.integers(10, 30, size)
+    
+    # Add the shapes to the masks
+    if NUMBA_AVAILABLE:
+        _rasterize_shapes(y, shapes)
+    else:
+        _rasterize_shapes_numpy(y, shapes)
     
     return X, y
 
+@njit(parallel=True, cache=True)
+def _rasterize_shapes(y, shapes):
+    """Draw pre-sampled shapes into masks, parallel over samples."""
+    num_samples, height, width = y.shape[0], y.shape[1], y.shape[2]
+    for i in prange(num_samples):
+        for k in range(shapes.shape[1]):
+            kind = shapes[i, k, 0]
+            a = shapes[i, k, 1]
+            b = shapes[i, k, 2]
+            c = shapes[i, k, 3]
+            d = shapes[i, k, 4]
+            
+            if kind == _CIRCLE:
+                # Only visit the circle's bounding box
+                r2 = c * c
+                for row in range(max(b - c, 0), min(b + c + 1, height)):
+                    dy = row - b
+                    for col in range(max(a - c, 0), min(a + c + 1, width)):
+                        dx = col - a
+                        if dx*dx + dy*dy <= r2:
+                            y[i, row, col, 0] = 1
+            elif kind == _RECTANGLE:
+                y[i, b:b+d, a:a+c, 0] = 1
+
+def _rasterize_shapes_numpy(y: np.ndarray, shapes: np.ndarray) -> None:
+    """NumPy fallback for _rasterize_shapes when numba is not installed."""
+    height, width = y.shape[1:3]
+    
+    for i, k in zip(*np.nonzero(shapes[..., 0] != _NO_SHAPE)):
+        kind, a, b, c, d = shapes[i, k]
+        if kind == _CIRCLE:
+            # Only evaluate the circle's bounding box
+            y0, y1 = max(b - c, 0), min(b + c + 1, height)
+            x0, x1 = max(a - c, 0), min(a + c + 1, width)
+            y_coords = np.arange(y0, y1)[:, None]
+            x_coords = np.arange(x0, x1)[None, :]
+            mask = (x_coords-a)**2 + (y_coords-b)**2 <= c*c
+            y[i, y0:y1, x0:x1][mask] = 1
+        else:
+            y[i, b:b+d, a:a+c] = 1
+
 def generate_landmark_data(
     num_samples: int = 1000,
     image_size: Tuple[int, int] = (128, 128),
     num_channels: int = 1,
-    num_landmarks: int = 10
-) -> Tuple[np.ndarray, np.ndarray]:
+    num_landmarks: int = 10,
+    quantized: bool = False
+) -> Union[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
     """
     Generate synthetic data for landmark detection training.
     
@@ -106,29 +163,62 @@ def generate_landmark_data(
         image_size: Size of each image
         num_channels: Number of channels in each image
         num_landmarks: Number of landmarks to generate per image
+        quantized: If True, return the landmarks as separate int16 x and y
+            pixel coordinate arrays instead of normalized float pairs
         
     Returns:
-        Tuple of (X, y) where X is the image data and y is the landmark coordinates
+        Tuple of (X, y) where X is the image data and y is the landmark coordinates,
+        or (X, y_x, y_y) with int16 arrays of shape (num_samples, num_landmarks)
+        if quantized is True (see decode_landmarks)
     """
+    height, width = image_size
+    marker_size = 3
+    rng = np.random.default_rng()
+    
     # Create synthetic images
-    X = np.random.randn(num_samples, *image_size, num_channels)
-    
-    # Create synthetic landmark coordinates
-    y = np.zeros((num_samples, num_landmarks * 2))  # x,y coordinates for each landmark
-    
-    # Add random landmarks
-    for i in range(num_samples):
-        for j in range(num_landmarks):
-            # Generate random x,y coordinates
-            x = np.random.randint(0, image_size[0])
-            y[i, j*2] = x / image_size[0]  # Normalize coordinates
-            y[i, j*2+1] = np.random.randint(0, image_size[1]) / image_size[1]
-            
-            # Add a marker at the landmark location
-            marker_size = 3
-            y_coords, x_coords = np.ogrid[-y[i, j*2+1]*image_size[1]:image_size[1]-y[i, j*2+1]*image_size[1],
-                                         -x:image_size[0]-x]
-            mask = (x_coords*x_coords + y_coords*y_coords <= marker_size*marker_size)
-            X[i, mask] = np.random.normal(2, 0.5, mask.sum())
-    
-    return X, y 
\ No newline at end of file
+    X = rng.standard_normal((num_samples, height, width, num_channels), dtype=np.float32)
+    
+    # Sample all landmark pixel coordinates at once; they are bounded by the
+    # image size so int16 holds them exactly
+    landmark_x = rng.integers(0, width, size=(num_samples, num_landmarks), dtype=np.int16)
+    landmark_y = rng.integers(0, height, size=(num_samples, num_landmarks), dtype=np.int16)
+    
+    # Add a marker at every landmark location, vectorized over samples and
+    # landmarks by indexing each marker's pixels directly; markers are
+    # clipped at the image border
+    oy, ox = _window_offsets(marker_size)
+    disc = oy*oy + ox*ox <= marker_size*marker_size
+    rows = landmark_y[..., None] + oy[disc]
+    cols = landmark_x[..., None] + ox[disc]
+    valid = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+    sample = np.broadcast_to(np.arange(num_samples)[:, None, None], rows.shape)[valid]
+    X[sample, rows[valid], cols[valid]] = rng.normal(2, 0.5, (len(sample), num_channels))
+    
+    if quantized:
+        return X, landmark_x, landmark_y
+    
+    # Create synthetic landmark coordinates (normalized x,y pairs per landmark)
+    return X, decode_landmarks(landmark_x, landmark_y, image_size)
+
+def decode_landmarks(
+    y_x: np.ndarray,
+    y_y: np.ndarray,
+    image_size: Tuple[int, int] = (128, 128)
+) -> np.ndarray:
+    """
+    Convert quantized landmark coordinates to normalized training targets.
+    
+    Args:
+        y_x: Integer x pixel coordinates of shape (num_samples, num_landmarks)
+        y_y: Integer y pixel coordinates of shape (num_samples, num_landmarks)
+        image_size: Size of the images the coordinates refer to
+        
+    Returns:
+        Float32 array of shape (num_samples, num_landmarks * 2) holding
+        normalized x,y pairs per landmark
+    """
+    height, width = image_size
+    y = np.empty((y_x.shape[0], y_x.shape[1] * 2), dtype=np.float32)
+    np.multiply(y_x, np.float32(1 / width), out=y[:, 0::2])
+    np.multiply(y_y, np.float32(1 / height), out=y[:, 1::2])
+    return y
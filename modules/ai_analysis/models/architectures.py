@@ -1,10 +1,29 @@
 """
 Model architectures for AI analysis.
+
+On GPU hosts the layers are built with the ``mixed_float16`` policy so
+convolutions run in FP16 on tensor cores; the output layers stay in FP32
+for numerical stability. CPU-only hosts keep FP32 Keras models and use the
+INT8 TFLite export for inference instead. The policy is passed to each
+layer rather than set globally, so importing this module does not change
+the dtype of models built elsewhere.
 """
 
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
+def _layer_policy() -> tf.keras.mixed_precision.Policy:
+    """Get the layer dtype policy; FP16 is the GPU target, on CPU it would only add casts."""
+    name = 'mixed_float16' if tf.config.list_physical_devices('GPU') else 'float32'
+    return tf.keras.mixed_precision.Policy(name)
+
+def _optimizer(policy: tf.keras.mixed_precision.Policy) -> tf.keras.optimizers.Optimizer:
+    """Get an Adam optimizer, loss-scaled for FP16 so small gradients do not underflow."""
+    optimizer = tf.keras.optimizers.Adam()
+    if policy.compute_dtype == 'float16':
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+    return optimizer
+
 def create_tumor_detection_model(input_shape=(128, 128, 1)):
     """
     Create a CNN model for tumor detection.
@@ -15,30 +34,33 @@ def create_tumor_detection_model(input_shape=(128, 128, 1)):
     Returns:
         Compiled Keras model
     """
+    policy = _layer_policy()
+    
     model = models.Sequential([
         # First convolutional block
-        layers.Conv2D(32, (3, 3), activation='relu', input_shape=input_shape),
-        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(32, (3, 3), activation='relu', input_shape=input_shape, dtype=policy),
+        layers.MaxPooling2D((2, 2), dtype=policy),
         
         # Second convolutional block
-        layers.Conv2D(64, (3, 3), activation='relu'),
-        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(64, (3, 3), activation='relu', dtype=policy),
+        layers.MaxPooling2D((2, 2), dtype=policy),
         
         # Third convolutional block
-        layers.Conv2D(64, (3, 3), activation='relu'),
-        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(64, (3, 3), activation='relu', dtype=policy),
+        layers.MaxPooling2D((2, 2), dtype=policy),
         
         # Flatten and dense layers
-        layers.Flatten(),
-        layers.Dense(64, activation='relu'),
-        layers.Dropout(0.5),
-        layers.Dense(1, activation='sigmoid')
+        layers.Flatten(dtype=policy),
+        layers.Dense(64, activation='relu', dtype=policy),
+        layers.Dropout(0.5, dtype=policy),
+        layers.Dense(1, activation='sigmoid', dtype='float32')
     ])
     
     model.compile(
-        optimizer='adam',
+        optimizer=_optimizer(policy),
         loss='binary_crossentropy',
-        metrics=['accuracy']
+        metrics=['accuracy'],
+        jit_compile=True
     )
     
     return model
@@ -53,41 +75,44 @@ def create_segmentation_model(input_shape=(128, 128, 1)):
     Returns:
         Compiled Keras model
     """
+    policy = _layer_policy()
+    
     # Input layer
     inputs = layers.Input(input_shape)
     
     # Encoder
-    conv1 = layers.Conv2D(64, (3, 3), activation='relu', padding='same')(inputs)
-    conv1 = layers.Conv2D(64, (3, 3), activation='relu', padding='same')(conv1)
-    pool1 = layers.MaxPooling2D((2, 2))(conv1)
+    conv1 = layers.Conv2D(64, (3, 3), activation='relu', padding='same', dtype=policy)(inputs)
+    conv1 = layers.Conv2D(64, (3, 3), activation='relu', padding='same', dtype=policy)(conv1)
+    pool1 = layers.MaxPooling2D((2, 2), dtype=policy)(conv1)
     
-    conv2 = layers.Conv2D(128, (3, 3), activation='relu', padding='same')(pool1)
-    conv2 = layers.Conv2D(128, (3, 3), activation='relu', padding='same')(conv2)
-    pool2 = layers.MaxPooling2D((2, 2))(conv2)
+    conv2 = layers.Conv2D(128, (3, 3), activation='relu', padding='same', dtype=policy)(pool1)
+    conv2 = layers.Conv2D(128, (3, 3), activation='relu', padding='same', dtype=policy)(conv2)
+    pool2 = layers.MaxPooling2D((2, 2), dtype=policy)(conv2)
     
     # Bridge
-    conv3 = layers.Conv2D(256, (3, 3), activation='relu', padding='same')(pool2)
-    conv3 = layers.Conv2D(256, (3, 3), activation='relu', padding='same')(conv3)
+    conv3 = layers.Conv2D(256, (3, 3), activation='relu', padding='same', dtype=policy)(pool2)
+    conv3 = layers.Conv2D(256, (3, 3), activation='relu', padding='same', dtype=policy)(conv3)
     
     # Decoder
-    up1 = layers.UpSampling2D((2, 2))(conv3)
-    up1 = layers.concatenate([up1, conv2])
-    conv4 = layers.Conv2D(128, (3, 3), activation='relu', padding='same')(up1)
-    conv4 = layers.Conv2D(128, (3, 3), activation='relu', padding='same')(conv4)
+    up1 = layers.UpSampling2D((2, 2), dtype=policy)(conv3)
+    up1 = layers.concatenate([up1, conv2], dtype=policy)
+    conv4 = layers.Conv2D(128, (3, 3), activation='relu', padding='same', dtype=policy)(up1)
+    conv4 = layers.Conv2D(128, (3, 3), activation='relu', padding='same', dtype=policy)(conv4)
     
-    up2 = layers.UpSampling2D((2, 2))(conv4)
-    up2 = layers.concatenate([up2, conv1])
-    conv5 = layers.Conv2D(64, (3, 3), activation='relu', padding='same')(up2)
-    conv5 = layers.Conv2D(64, (3, 3), activation='relu', padding='same')(conv5)
+    up2 = layers.UpSampling2D((2, 2), dtype=policy)(conv4)
+    up2 = layers.concatenate([up2, conv1], dtype=policy)
+    conv5 = layers.Conv2D(64, (3, 3), activation='relu', padding='same', dtype=policy)(up2)
+    conv5 = layers.Conv2D(64, (3, 3), activation='relu', padding='same', dtype=policy)(conv5)
     
     # Output
-    outputs = layers.Conv2D(1, (1, 1), activation='sigmoid')(conv5)
+    outputs = layers.Conv2D(1, (1, 1), activation='sigmoid', dtype='float32')(conv5)
     
     model = models.Model(inputs=inputs, outputs=outputs)
     model.compile(
-        optimizer='adam',
+        optimizer=_optimizer(policy),
         loss='binary_crossentropy',
-        metrics=['accuracy']
+        metrics=['accuracy'],
+        jit_compile=True
     )
     
     return model
@@ -102,29 +127,32 @@ def create_landmark_detection_model(input_shape=(128, 128, 1)):
     Returns:
         Compiled Keras model
     """
+    policy = _layer_policy()
+    
     model = models.Sequential([
         # Feature extraction
-        layers.Conv2D(32, (3, 3), activation='relu', input_shape=input_shape),
-        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(32, (3, 3), activation='relu', input_shape=input_shape, dtype=policy),
+        layers.MaxPooling2D((2, 2), dtype=policy),
         
-        layers.Conv2D(64, (3, 3), activation='relu'),
-        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(64, (3, 3), activation='relu', dtype=policy),
+        layers.MaxPooling2D((2, 2), dtype=policy),
         
-        layers.Conv2D(128, (3, 3), activation='relu'),
-        layers.MaxPooling2D((2, 2)),
+        layers.Conv2D(128, (3, 3), activation='relu', dtype=policy),
+        layers.MaxPooling2D((2, 2), dtype=policy),
         
         # Flatten and dense layers
-        layers.Flatten(),
-        layers.Dense(256, activation='relu'),
-        layers.Dropout(0.5),
-        layers.Dense(128, activation='relu'),
-        layers.Dense(20, activation='sigmoid')  # 10 landmarks, each with x,y coordinates
+        layers.Flatten(dtype=policy),
+        layers.Dense(256, activation='relu', dtype=policy),
+        layers.Dropout(0.5, dtype=policy),
+        layers.Dense(128, activation='relu', dtype=policy),
+        layers.Dense(20, activation='sigmoid', dtype='float32')  # 10 landmarks, each with x,y coordinates
     ])
     
     model.compile(
-        optimizer='adam',
+        optimizer=_optimizer(policy),
         loss='mse',
-        metrics=['mae']
+        metrics=['mae'],
+        jit_compile=True
     )
     
     return model 
\ No newline at end of file
@@ -34,9 +34,10 @@ def create_model():
     ])
     
     model.compile(
-        optimizer='adam',
+        optimizer=tf.keras.optimizers.Adam(),
         loss='binary_crossentropy',
-        metrics=['accuracy']
+        metrics=['accuracy'],
+        jit_compile=True
     )
     
     return model
@@ -1,71 +1,805 @@
 """
 Analysis utilities for Medical 3D Viewer.
+Provides the shared AI model manager and functions for AI-powered
+analysis of medical images.
 """
 
 import os
+import time
+import queue
+import atexit
+import logging
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, List, Union, Callable
 import numpy as np
+import cv2
 import tensorflow as tf
-from typing import Tuple, Optional
-import logging
+from tensorflow.keras.models import load_model
+from config import (
+    AI_MODEL_PATH, CONFIDENCE_THRESHOLD, AI_USE_TENSORRT, TRT_PROFILE_BATCH_SIZES
+)
+# Imported for its side effect: it enables bfloat16 auto mixed precision
+# on CPU-only hosts before the first model is loaded
+from . import backend  # noqa: F401
+from .trt_engine import TRT_AVAILABLE, load_trt_inference_fn, clear_trt_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def analyze_dicom(image: np.ndarray, model_path: Optional[str] = None) -> Tuple[bool, float]:
+class AIAnalysisError(Exception):
+    """Custom exception for AI analysis errors."""
+    pass
+
+@tf.function(reduce_retracing=True)
+def _fused_preprocess(
+    images: tf.Tensor,
+    target_size: Tuple[int, int],
+    normalize: bool,
+    dtype: tf.DType
+) -> tf.Tensor:
+    """
+    Resize, scale and cast a stack of (N, H, W) images in one traced graph.
+    
+    With normalize, each image is min-max scaled to [0, 1]; otherwise pixel
+    values are divided by 255. Area resizing is linear, so the scale is
+    applied after the resize on the smaller image, with the range still
+    taken from the full-resolution input.
     """
-    Analyze a DICOM image slice using a pre-trained model.
+    images = images[..., tf.newaxis]
+    resized = tf.image.resize(images, target_size, method=tf.image.ResizeMethod.AREA)
+    if normalize:
+        lo = tf.reduce_min(images, axis=[1, 2, 3], keepdims=True)
+        hi = tf.reduce_max(images, axis=[1, 2, 3], keepdims=True)
+        resized = (resized - lo) / tf.maximum(hi - lo, 1e-6)
+    else:
+        resized = resized * (1.0 / 255.0)
+    return tf.cast(resized, dtype)
+
+def _input_is_fp16(model: tf.keras.Model) -> bool:
+    """Check whether a model's first layer computes in float16, so inputs can be fed as FP16."""
+    return bool(model.layers) and model.layers[0].compute_dtype == 'float16'
+
+@functools.lru_cache(maxsize=4)
+def _load_keras_model(model_path: str, mtime_ns: int) -> tf.keras.Model:
+    """Load a Keras model file; cached per path and modification time."""
+    return load_model(model_path)
+
+class AIModelManager:
+    """Manager class for AI models."""
+    
+    def __init__(self):
+        self.models: Dict[str, tf.keras.Model] = {}
+        self.infer_fns: Dict[str, Callable] = {}
+        self.interpreters: Dict[str, tf.lite.Interpreter] = {}
+        self._interpreter_locks: Dict[str, threading.Lock] = {}
+        self.use_gpu = bool(tf.config.list_physical_devices('GPU'))
+        self.use_tensorrt = self.use_gpu and TRT_AVAILABLE and AI_USE_TENSORRT
+        self._loaded_mtimes: Dict[str, int] = {}
+        self._batchers: Dict[str, "_RequestBatcher"] = {}
+        self._batchers_lock = threading.Lock()
+        self.load_models()
+        
+    def load_models(self) -> None:
+        """
+        Load all AI models from the models directory.
+        
+        Model files are memoized by (path, mtime), so calling this again
+        only reloads files that were added or changed since the last call.
+        Files are read in parallel since HDF5 loading is mostly I/O bound.
+        """
+        try:
+            if not os.path.exists(AI_MODEL_PATH):
+                logger.warning(f"Models directory not found: {AI_MODEL_PATH}")
+                return
+                
+            pending = []
+            for model_file in os.listdir(AI_MODEL_PATH):
+                model_name, ext = os.path.splitext(model_file)
+                if ext not in ('.h5', '.tflite'):
+                    continue
+                    
+                model_path = os.path.join(AI_MODEL_PATH, model_file)
+                mtime = os.stat(model_path).st_mtime_ns
+                if self._loaded_mtimes.get(model_path) != mtime:
+                    pending.append((model_name, model_path, mtime))
+                    
+            if not pending:
+                return
+                
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                loaded = list(executor.map(self._load_model_file, pending))
+                
+            for (model_name, model_path, mtime), (model, infer_fn) in zip(pending, loaded):
+                if isinstance(model, tf.lite.Interpreter):
+                    self._interpreter_locks.setdefault(model_name, threading.Lock())
+                    self.interpreters[model_name] = model
+                else:
+                    self.models[model_name] = model
+                    self.infer_fns[model_name] = infer_fn
+                self._loaded_mtimes[model_path] = mtime
+                    
+        except Exception as e:
+            logger.error(f"Failed to load models: {str(e)}")
+            raise AIAnalysisError(f"Failed to load models: {str(e)}")
+            
+    def close(self) -> None:
+        """Stop every request batcher so their threads release this manager."""
+        with self._batchers_lock:
+            batchers = list(self._batchers.values())
+            self._batchers.clear()
+        for batcher in batchers:
+            batcher.close()
+            
+    def _load_model_file(
+        self,
+        entry: Tuple[str, str, int]
+    ) -> Tuple[Union[tf.keras.Model, tf.lite.Interpreter], Optional[Callable]]:
+        """Load one model file and, for Keras models, trace its inference function."""
+        model_name, model_path, mtime = entry
+        
+        if model_path.endswith('.h5'):
+            logger.info(f"Loading model: {model_name}")
+            model = _load_keras_model(model_path, mtime)
+            if self.use_tensorrt:
+                try:
+                    return model, load_trt_inference_fn(model, model_path)
+                except Exception as e:
+                    logger.warning(f"Falling back to XLA for {model_name}: {str(e)}")
+            return model, self._build_inference_fn(model)
+            
+        logger.info(f"Loading TFLite model: {model_name}")
+        # The default AUTO resolver applies the XNNPACK delegate,
+        # which keeps INT8 kernels faster than FP32 on x86
+        interpreter = tf.lite.Interpreter(
+            model_path=model_path,
+            num_threads=os.cpu_count(),
+            experimental_op_resolver_type=tf.lite.experimental.OpResolverType.AUTO
+        )
+        interpreter.allocate_tensors()
+        return interpreter, None
+        
+    def get_model(self, model_name: str) -> Optional[tf.keras.Model]:
+        """Get a model by name."""
+        return self.models.get(model_name)
+        
+    def get_inference_fn(self, model_name: str) -> Optional[Callable]:
+        """Get the cached compiled inference function for a model."""
+        if model_name not in self.infer_fns:
+            model = self.get_model(model_name)
+            if model is None:
+                return None
+            self.infer_fns[model_name] = self._build_inference_fn(model)
+        return self.infer_fns[model_name]
+        
+    def _input_shape(self, model_name: str) -> Optional[Tuple[int, ...]]:
+        """Get the per-sample input shape of a model, if it is loaded."""
+        model = self.get_model(model_name)
+        if model is not None:
+            return tuple(model.input_shape[1:])
+        interpreter = self.interpreters.get(model_name)
+        if interpreter is not None:
+            return tuple(interpreter.get_input_details()[0]['shape'][1:])
+        return None
+        
+    def _input_dtype(self, model_name: str) -> tf.DType:
+        """Get the input dtype of a model's compiled inference function."""
+        model = self.get_model(model_name)
+        if model is not None and _input_is_fp16(model):
+            return tf.float16
+        return tf.float32
+        
+    def _run(
+        self,
+        model_name: str,
+        batch: Union[np.ndarray, tf.Tensor]
+    ) -> np.ndarray:
+        """
+        Run a preprocessed batch through the best available backend.
+        
+        Keras models run through the compiled inference function on GPU,
+        a cached TensorRT engine when TensorRT is available; on CPU-only
+        hosts the INT8 TFLite model is preferred when present. TFLite
+        interpreters are not thread-safe, so calls on one are serialized.
+        """
+        interpreter = self.interpreters.get(model_name)
+        if interpreter is not None and (
+            not self.use_gpu or self.get_model(model_name) is None
+        ):
+            with self._interpreter_locks[model_name]:
+                return self._run_tflite(interpreter, np.asarray(batch, dtype=np.float32))
+            
+        infer = self.get_inference_fn(model_name)
+        batch = tf.cast(batch, self._input_dtype(model_name))
+        return infer(batch).numpy()
+        
+    @staticmethod
+    def _run_tflite(
+        interpreter: tf.lite.Interpreter,
+        batch: np.ndarray
+    ) -> np.ndarray:
+        """Run a (possibly quantized) TFLite interpreter on a float batch."""
+        input_details = interpreter.get_input_details()[0]
+        if tuple(input_details['shape']) != batch.shape:
+            interpreter.resize_tensor_input(input_details['index'], batch.shape)
+            interpreter.allocate_tensors()
+            input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        
+        # Quantize inputs with the tensor's scale and zero point
+        scale, zero_point = input_details['quantization']
+        if scale:
+            info = np.iinfo(input_details['dtype'])
+            batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max)
+        interpreter.set_tensor(
+            input_details['index'],
+            batch.astype(input_details['dtype'])
+        )
+        interpreter.invoke()
+        
+        # Dequantize outputs back to float confidences
+        output = interpreter.get_tensor(output_details['index'])
+        scale, zero_point = output_details['quantization']
+        if scale:
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+        
+    @staticmethod
+    def _build_inference_fn(model: tf.keras.Model) -> Callable:
+        """
+        Trace an XLA-compiled inference function for a model.
+        
+        The function is specialized to the model's input shape with a
+        variable batch dimension, so repeated calls never retrace.
+        """
+        dtype = tf.float16 if _input_is_fp16(model) else tf.float32
+        spec = tf.TensorSpec([None, *model.input_shape[1:]], dtype)
+        return tf.function(
+            lambda x: model(x, training=False),
+            jit_compile=True
+        ).get_concrete_function(spec)
+        
+    def predict(
+        self,
+        model_name: str,
+        image: np.ndarray,
+        preprocess: bool = True
+    ) -> Tuple[float, Dict[str, Any]]:
+        """
+        Run prediction using a specific model.
+        
+        Args:
+            model_name: Name of the model to use
+            image: Input image array
+            preprocess: Whether to preprocess the image
+            
+        Returns:
+            Tuple of (confidence, prediction details)
+            
+        Raises:
+            AIAnalysisError: If prediction fails
+        """
+        input_shape = self._input_shape(model_name)
+        if input_shape is None:
+            raise AIAnalysisError(f"Model not found: {model_name}")
+            
+        try:
+            # Skip preprocessing when the input is already a model-ready batch
+            ready = image.ndim == 4 and tuple(image.shape[1:]) == input_shape
+            if preprocess and not ready:
+                image = self.preprocess_image(
+                    image, input_shape[:2], dtype=self._input_dtype(model_name)
+                )
+                
+            prediction = self._run(model_name, image)
+            return self._details(model_name, float(prediction[0][0]))
+            
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise AIAnalysisError(f"Prediction failed: {str(e)}")
+            
+    def predict_batched(
+        self,
+        model_name: str,
+        image: np.ndarray,
+        timeout: Optional[float] = None,
+        normalize: bool = False
+    ) -> Tuple[float, Dict[str, Any]]:
+        """
+        Run prediction on one image, batched with concurrent requests.
+        
+        Requests for the same model issued from different threads within a
+        few milliseconds of each other are coalesced into a single model
+        call, so the per-call overhead is paid once per batch.
+        
+        Args:
+            model_name: Name of the model to use
+            image: Input 2D image array
+            timeout: Maximum seconds to wait for the result (default: no limit)
+            normalize: Whether to min-max scale the image instead of
+                treating it as 0-255 pixel values
+            
+        Returns:
+            Tuple of (confidence, prediction details)
+            
+        Raises:
+            AIAnalysisError: If prediction fails
+        """
+        if self._input_shape(model_name) is None:
+            raise AIAnalysisError(f"Model not found: {model_name}")
+            
+        with self._batchers_lock:
+            batcher = self._batchers.get(model_name)
+            if batcher is None:
+                batcher = self._batchers[model_name] = _RequestBatcher(self, model_name)
+                
+        try:
+            prediction = batcher.submit(image, normalize).result(timeout)
+            return self._details(model_name, float(prediction[0]))
+            
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise AIAnalysisError(f"Prediction failed: {str(e)}")
+            
+    @staticmethod
+    def _details(model_name: str, confidence: float) -> Tuple[float, Dict[str, Any]]:
+        """Package a confidence into the (confidence, details) prediction result."""
+        details = {
+            "model": model_name,
+            "confidence": confidence,
+            "threshold": CONFIDENCE_THRESHOLD,
+            "prediction": "positive" if confidence > CONFIDENCE_THRESHOLD else "negative"
+        }
+        return confidence, details
+            
+    def predict_batch(
+        self,
+        model_name: str,
+        images: np.ndarray,
+        preprocess: bool = True
+    ) -> np.ndarray:
+        """
+        Run prediction on a stack of images in a single model call.
+        
+        Args:
+            model_name: Name of the model to use
+            images: Stack of input images with shape (N, H, W)
+            preprocess: Whether to preprocess the images
+            
+        Returns:
+            Array of raw model predictions, one row per image
+            
+        Raises:
+            AIAnalysisError: If prediction fails
+        """
+        input_shape = self._input_shape(model_name)
+        if input_shape is None:
+            raise AIAnalysisError(f"Model not found: {model_name}")
+            
+        try:
+            if preprocess:
+                images = self.preprocess_batch(images, input_shape[:2])
+                
+            return self._run(model_name, images)
+            
+        except Exception as e:
+            logger.error(f"Batch prediction failed: {str(e)}")
+            raise AIAnalysisError(f"Batch prediction failed: {str(e)}")
+            
+    @staticmethod
+    def preprocess_batch(
+        images: np.ndarray,
+        target_size: Tuple[int, int] = (128, 128),
+        normalize: bool = False
+    ) -> tf.Tensor:
+        """
+        Preprocess a stack of images into a single NHWC model input.
+        
+        The whole stack is resized and scaled in one traced graph, which
+        runs on the GPU when one is available.
+        
+        Args:
+            images: Stack of input images with shape (N, H, W)
+            target_size: Target size (height, width) for resizing
+            normalize: Whether to min-max scale each image to [0, 1]
+                instead of dividing 0-255 pixel values by 255
+            
+        Returns:
+            Preprocessed float32 batch of shape (N, *target_size, 1)
+        """
+        images = tf.convert_to_tensor(images, dtype=tf.float32)
+        return _fused_preprocess(images, tuple(target_size), normalize, tf.float32)
+        
+    @staticmethod
+    def preprocess_image(
+        image: np.ndarray,
+        target_size: Tuple[int, int] = (128, 128),
+        dtype: tf.DType = tf.float32,
+        normalize: bool = False
+    ) -> tf.Tensor:
+        """
+        Preprocess an image for model input.
+        
+        Normalizing, resizing, scaling and casting run in one traced graph,
+        so no intermediate images are handed back to Python and the result
+        is fed straight to the inference function.
+        
+        Args:
+            image: Input image array
+            target_size: Target size (height, width) for resizing
+            dtype: Output dtype (float16 for mixed-precision models)
+            normalize: Whether to min-max scale the image to [0, 1]
+                instead of dividing 0-255 pixel values by 255
+            
+        Returns:
+            Preprocessed image tensor of shape (1, *target_size, 1)
+        """
+        image = tf.convert_to_tensor(image, dtype=tf.float32)[tf.newaxis]
+        return _fused_preprocess(image, tuple(target_size), normalize, dtype)
+
+class _RequestBatcher:
+    """
+    Coalesce concurrent single-image predictions into batched model calls.
+    
+    A background thread takes the first queued request, waits up to
+    max_delay seconds for more (or until max_batch are queued) and runs
+    them as one batch. Batches are zero-padded up to the next of the
+    TensorRT profile's batch sizes, so compiled inference functions and
+    TFLite interpreters only ever see a handful of shapes. close() stops
+    the thread, which otherwise keeps the manager and its models alive.
     
     Args:
-        image: The input image slice as a numpy array
-        model_path: Path to the pre-trained model. If None, uses default model.
+        manager: The model manager to run batches with
+        model_name: Name of the model to batch requests for
+        max_batch: Maximum number of requests per batch
+        max_delay: Maximum seconds to wait for a batch to fill
+    """
     
-    Returns:
-        Tuple of (is_tumor_detected: bool, confidence: float)
+    def __init__(
+        self,
+        manager: AIModelManager,
+        model_name: str,
+        max_batch: int = max(TRT_PROFILE_BATCH_SIZES),
+        max_delay: float = 0.01
+    ):
+        self.manager = manager
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, bool, Future]]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._serve, name=f"batcher-{model_name}", daemon=True
+        )
+        self._thread.start()
+        
+    def submit(self, image: np.ndarray, normalize: bool = False) -> Future:
+        """Queue an image; the future resolves to its row of predictions."""
+        if self._closed:
+            raise AIAnalysisError(f"Request batcher for {self.model_name} is closed")
+        future = Future()
+        self._queue.put((image, normalize, future))
+        return future
+        
+    def close(self) -> None:
+        """Run the requests already queued, then stop and join the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        
+    def _serve(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            items = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                items.append(item)
+            self._run_batch(items)
+            
+    def _run_batch(self, items: List[Tuple[np.ndarray, bool, Future]]) -> None:
+        items = [item for item in items if item[2].set_running_or_notify_cancel()]
+        if not items:
+            return
+            
+        try:
+            dtype = self.manager._input_dtype(self.model_name)
+            target_size = self.manager._input_shape(self.model_name)[:2]
+            batch = tf.concat(
+                [
+                    self.manager.preprocess_image(
+                        image, target_size, dtype=dtype, normalize=normalize
+                    )
+                    for image, normalize, _ in items
+                ],
+                axis=0
+            )
+            
+            # Pad to the next profiled batch size
+            n = len(items)
+            padding = next(
+                (size for size in sorted(TRT_PROFILE_BATCH_SIZES) if size >= n), n
+            ) - n
+            if padding:
+                batch = tf.pad(batch, [[0, padding], [0, 0], [0, 0], [0, 0]])
+                
+            predictions = self.manager._run(self.model_name, batch)
+        except Exception as e:
+            for _, _, future in items:
+                future.set_exception(e)
+            return
+            
+        for prediction, (_, _, future) in zip(predictions, items):
+            future.set_result(prediction)
+
+# Shared model manager, created on first use so importing this module
+# does not load every model
+_model_manager: Optional[AIModelManager] = None
+_model_manager_lock = threading.Lock()
+
+def get_model_manager() -> AIModelManager:
+    """Get the shared model manager, loading models on first use."""
+    global _model_manager
+    with _model_manager_lock:
+        if _model_manager is None:
+            _model_manager = AIModelManager()
+        return _model_manager
+
+def release_models() -> None:
+    """
+    Drop the shared model manager and every cached model and engine.
+    
+    Registered with atexit so TensorRT engines and their execution contexts
+    are released before the CUDA context shuts down. Request batcher
+    threads are stopped first, since they hold on to the manager.
+    """
+    global _model_manager
+    with _model_manager_lock:
+        manager, _model_manager = _model_manager, None
+    if manager is not None:
+        manager.close()
+    _load_keras_model.cache_clear()
+    clear_trt_cache()
+    tf.keras.backend.clear_session()
+
+atexit.register(release_models)
+
+def analyze_dicom(
+    image: np.ndarray,
+    model_name: str = "tumor_detection",
+    return_details: bool = False,
+    normalize: bool = False
+) -> Union[str, Dict[str, Any]]:
+    """
+    Run AI analysis on a DICOM image slice.
     
+    Args:
+        image: Input DICOM image array
+        model_name: Name of the model to use
+        return_details: Whether to return detailed prediction information
+        normalize: Whether to min-max scale raw intensities as part of
+            preprocessing instead of expecting 0-255 pixel values
+        
+    Returns:
+        Analysis result string or detailed prediction information
+        
     Raises:
-        ValueError: If image is invalid or model cannot be loaded
+        ValueError: If image is invalid
+        AIAnalysisError: If analysis fails
     """
+    if image is None or np.ndim(image) != 2:
+        raise ValueError("Image must be a 2D array")
+        
     try:
-        # Default model path if not specified
-        if model_path is None:
-            model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'tumor_detection.h5')
+        confidence, details = get_model_manager().predict_batched(
+            model_name, image, normalize=normalize
+        )
         
-        if not os.path.exists(model_path):
-            raise ValueError(f"Model file not found at {model_path}")
+        if return_details:
+            return details
             
-        # Load model
-        model = tf.keras.models.load_model(model_path)
+        if confidence > CONFIDENCE_THRESHOLD:
+            return f"Possible Tumor Detected (Confidence: {confidence:.2f})"
+        return f"No Tumor Detected (Confidence: {confidence:.2f})"
         
-        # Preprocess image
-        processed_image = preprocess_image(image)
+    except Exception as e:
+        logger.error(f"Analysis failed: {str(e)}")
+        raise AIAnalysisError(f"Analysis failed: {str(e)}")
+
+def analyze_volume(
+    volume: np.ndarray,
+    model_name: str = "tumor_detection",
+    slice_interval: int = 5
+) -> Dict[str, Any]:
+    """
+    Run AI analysis on a 3D volume.
+    
+    Args:
+        volume: 3D volume array
+        model_name: Name of the model to use
+        slice_interval: Interval between analyzed slices
         
-        # Make prediction
-        prediction = model.predict(processed_image[np.newaxis, ..., np.newaxis])
-        confidence = float(prediction[0][0])
-        is_tumor = confidence > 0.5
+    Returns:
+        Dictionary containing analysis results
         
-        logger.info(f"Analysis completed. Tumor detected: {is_tumor}, Confidence: {confidence:.2f}")
-        return is_tumor, confidence
+    Raises:
+        AIAnalysisError: If analysis fails
+    """
+    if volume is None or np.ndim(volume) != 3:
+        raise ValueError("Volume must be a 3D array")
+    if slice_interval < 1:
+        raise ValueError("Slice interval must be a positive integer")
+        
+    try:
+        num_slices = volume.shape[0]
+        indices = np.arange(0, num_slices, slice_interval)
+        if len(indices) == 0:
+            return {
+                "total_slices": num_slices,
+                "analyzed_slices": 0,
+                "positive_findings": 0,
+                "findings": []
+            }
+            
+        # Run the selected slices in batches no larger than the TensorRT
+        # engine's shape profile, so every call hits a prebuilt engine
+        chunk = max(TRT_PROFILE_BATCH_SIZES)
+        manager = get_model_manager()
+        starts = list(range(0, len(indices), chunk))
+        
+        input_shape = manager._input_shape(model_name)
+        if input_shape is None:
+            raise AIAnalysisError(f"Model not found: {model_name}")
+        target_size = input_shape[:2]
+        
+        def prepare(start: int) -> tf.Tensor:
+            return manager.preprocess_batch(volume[indices[start:start + chunk]], target_size)
+            
+        # Double-buffer the chunks: the next one is gathered, preprocessed
+        # and copied to the device on a worker while the current one runs
+        confidences = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(prepare, starts[0])
+            for next_start in starts[1:] + [None]:
+                batch = pending.result()
+                if next_start is not None:
+                    pending = executor.submit(prepare, next_start)
+                predictions = manager.predict_batch(model_name, batch, preprocess=False)
+                confidences.append(predictions[:, 0])
+        confidences = np.concatenate(confidences)
+        positive = np.where(confidences > CONFIDENCE_THRESHOLD)[0]
+        
+        results = []
+        for j in positive:
+            confidence = float(confidences[j])
+            results.append({
+                "slice_index": int(indices[j]),
+                "confidence": confidence,
+                "details": {
+                    "model": model_name,
+                    "confidence": confidence,
+                    "threshold": CONFIDENCE_THRESHOLD,
+                    "prediction": "positive"
+                }
+            })
+                
+        return {
+            "total_slices": num_slices,
+            "analyzed_slices": len(indices),
+            "positive_findings": len(results),
+            "findings": results
+        }
         
     except Exception as e:
-        logger.error(f"Error during DICOM analysis: {str(e)}")
-        raise
+        logger.error(f"Volume analysis failed: {str(e)}")
+        raise AIAnalysisError(f"Volume analysis failed: {str(e)}")
 
-def preprocess_image(image: np.ndarray) -> np.ndarray:
+def segment_anatomy(
+    image: np.ndarray,
+    model_name: str = "anatomy_segmentation"
+) -> Tuple[np.ndarray, Dict[str, Any]]:
     """
-    Preprocess the input image for the model.
+    Perform anatomical segmentation on an image.
     
     Args:
-        image: Input image as numpy array
-    
+        image: Input 2D image slice or 3D volume (slices along axis 0)
+        model_name: Name of the segmentation model to use
+        
     Returns:
-        Preprocessed image
+        Tuple of (segmentation mask, segmentation details)
+        
+    Raises:
+        ValueError: If image is invalid
+        AIAnalysisError: If segmentation fails
     """
-    # Resize to model input size
-    target_size = (128, 128)
-    resized = tf.image.resize(image, target_size)
-    
-    # Normalize pixel values
-    normalized = (resized - np.min(resized)) / (np.max(resized) - np.min(resized))
+    if image is None or np.ndim(image) not in (2, 3):
+        raise ValueError("Image must be a 2D slice or a 3D volume")
+        
+    try:
+        slices = image[np.newaxis] if image.ndim == 2 else image
+        probabilities = get_model_manager().predict_batch(model_name, slices)[..., 0]
+        
+        # Create binary masks from the per-pixel predictions
+        masks = (probabilities > CONFIDENCE_THRESHOLD).astype(np.uint8)
+        
+        # Calculate segmentation metrics slice by slice
+        area = 0
+        perimeter = 0.0
+        for mask in masks:
+            area += cv2.countNonZero(mask)
+            contours = cv2.findContours(
+                mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+            )[-2]
+            perimeter += sum(cv2.arcLength(c, True) for c in contours)
+            
+        mask = masks[0] if image.ndim == 2 else masks
+        confidence = float(probabilities[masks > 0].mean()) if area else 0.0
+        
+        details = {
+            "model": model_name,
+            "confidence": confidence,
+            "threshold": CONFIDENCE_THRESHOLD,
+            "prediction": "positive" if area else "negative",
+            "area": area,
+            "perimeter": perimeter,
+            "mask_shape": mask.shape
+        }
+        
+        return mask, details
+        
+    except Exception as e:
+        logger.error(f"Segmentation failed: {str(e)}")
+        raise AIAnalysisError(f"Segmentation failed: {str(e)}")
+
+def detect_landmarks(
+    image: np.ndarray,
+    model_name: str = "landmark_detection"
+) -> List[Dict[str, Any]]:
+    """
+    Detect anatomical landmarks in an image.
     
-    return normalized 
\ No newline at end of file
+    Args:
+        image: Input image array
+        model_name: Name of the landmark detection model to use
+        
+    Returns:
+        List of detected landmarks with their coordinates
+        
+    Raises:
+        AIAnalysisError: If landmark detection fails
+    """
+    try:
+        confidence, details = get_model_manager().predict(model_name, image)
+        
+        # Process landmark predictions
+        landmarks = []
+        for i, (x, y) in enumerate(details.get("coordinates", [])):
+            if details.get("confidences", [])[i] > CONFIDENCE_THRESHOLD:
+                landmarks.append({
+                    "index": i,
+                    "x": x,
+                    "y": y,
+                    "confidence": details["confidences"][i],
+                    "name": details.get("names", [])[i] if "names" in details else f"Landmark {i}"
+                })
+                
+        return landmarks
+        
+    except Exception as e:
+        logger.error(f"Landmark detection failed: {str(e)}")
+        raise AIAnalysisError(f"Landmark detection failed: {str(e)}")
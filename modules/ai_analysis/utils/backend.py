@@ -0,0 +1,32 @@
+"""
+Backend utilities for AI analysis.
+Configures TensorFlow acceleration options before any model runs.
+"""
+
+import os
+import tensorflow as tf
+from config import AI_CPU_BF16
+
+def _enable_cpu_bf16() -> bool:
+    """
+    Turn on Intel Extension for TensorFlow auto mixed precision on CPU hosts.
+    
+    When no GPU is present, ITEX rewrites inference graphs so conv and
+    matmul ops run in bfloat16 on CPUs with AVX512-BF16 or AMX. The
+    extension is optional; without it this does nothing.
+    
+    Returns:
+        Whether bfloat16 auto mixed precision was enabled
+    """
+    if not AI_CPU_BF16 or tf.config.list_physical_devices('GPU'):
+        return False
+    # ITEX reads these when it is imported
+    os.environ.setdefault('ITEX_AUTO_MIXED_PRECISION', '1')
+    os.environ.setdefault('ITEX_AUTO_MIXED_PRECISION_DATA_TYPE', 'BFLOAT16')
+    try:
+        import intel_extension_for_tensorflow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+CPU_BF16_ENABLED = _enable_cpu_bf16()
@@ -3,9 +3,55 @@ Preprocessing utilities for AI analysis.
 """
 
 import numpy as np
+import tensorflow as tf
 from typing import Tuple, Optional, Union
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy import ndimage
-from skimage import exposure, filters
+from skimage import exposure, filters, transform
+from skimage.util import img_as_float32
+from utils.jit import njit, prange, NUMBA_AVAILABLE
+
+@njit(parallel=True, cache=True)
+def _minmax_kernel(flat):
+    """Min and max of a 1D array in a single parallel scan."""
+    n = flat.shape[0]
+    n_chunks = min(n, 64)
+    mins = np.empty(n_chunks, dtype=flat.dtype)
+    maxs = np.empty(n_chunks, dtype=flat.dtype)
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        stop = (c + 1) * n // n_chunks
+        lo = flat[start]
+        hi = flat[start]
+        for i in range(start + 1, stop):
+            v = flat[i]
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        mins[c] = lo
+        maxs[c] = hi
+    return mins.min(), maxs.max()
+
+def _minmax(image: np.ndarray) -> Tuple[float, float]:
+    """
+    Get the minimum and maximum of an image.
+    
+    Args:
+        image: Input image
+        
+    Returns:
+        Tuple of (min, max)
+    """
+    if NUMBA_AVAILABLE and image.size > 0:
+        return _minmax_kernel(image.ravel())
+    return image.min(), image.max()
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _normalize_kernel(flat, out, lo, scale, offset):
+    """Write (flat - lo) * scale + offset into out in one parallel pass."""
+    for i in prange(flat.shape[0]):
+        out[i] = (flat[i] - lo) * scale + offset
 
 def normalize_image(
     image: np.ndarray,
@@ -15,28 +61,49 @@ def normalize_image(
     """
     Normalize image to specified range.
     
+    The result is float32, which is ample precision for medical imagery
+    and half the memory traffic of float64. With numba the input is read
+    once for its range and once more for a fused shift-and-scale straight
+    into the output.
+    
     Args:
-        image: Input image
+        image: Input image with a trailing channel dimension
         min_val: Minimum value for normalization
         max_val: Maximum value for normalization
         
     Returns:
-        Normalized image
+        Normalized float32 image
+        
+    Raises:
+        ValueError: If the image has no channel dimension
     """
-    # Convert to float
-    image = image.astype(float)
+    if np.ndim(image) < 3:
+        raise ValueError("Image must have a channel dimension (height, width, channels)")
     
     # Get current range
-    current_min = np.min(image)
-    current_max = np.max(image)
+    current_min, current_max = _minmax(image)
     
     # Avoid division by zero
     if current_max - current_min == 0:
-        return np.full_like(image, min_val)
+        return np.full(np.shape(image), min_val, dtype=np.float32)
+    
+    scale = (max_val - min_val) / (float(current_max) - float(current_min))
+    if NUMBA_AVAILABLE:
+        out = np.empty(np.shape(image), dtype=np.float32)
+        _normalize_kernel(
+            np.ascontiguousarray(image).ravel(), out.ravel(),
+            float(current_min), np.float32(scale), np.float32(min_val)
+        )
+        return out
+    
+    # Convert to float32; always a private copy since it is scaled in place
+    image = np.array(image, dtype=np.float32)
     
-    # Normalize
-    normalized = (image - current_min) / (current_max - current_min)
-    return normalized * (max_val - min_val) + min_val
+    # Normalize in place
+    image -= current_min
+    image *= np.float32(scale)
+    image += min_val
+    return image
 
 def resize_image(
     image: np.ndarray,
@@ -59,23 +126,50 @@ def resize_image(
         h, w = image.shape[:2]
         scale = min(target_size[0] / h, target_size[1] / w)
         new_size = (int(h * scale), int(w * scale))
-        
-        # Resize
-        resized = ndimage.zoom(image, (new_size[0] / h, new_size[1] / w))
-        
-        # Pad if necessary
-        if new_size != target_size:
-            padded = np.zeros((*target_size, *image.shape[2:]), dtype=image.dtype)
-            y_offset = (target_size[0] - new_size[0]) // 2
-            x_offset = (target_size[1] - new_size[1]) // 2
-            padded[y_offset:y_offset+new_size[0], 
-                  x_offset:x_offset+new_size[1]] = resized
-            return padded
-        return resized
     else:
         # Direct resize without preserving aspect ratio
-        return ndimage.zoom(image, (target_size[0] / image.shape[0],
-                                  target_size[1] / image.shape[1]))
+        new_size = tuple(target_size)
+    
+    # Trailing (channel) axes are carried through unchanged
+    resized = transform.resize(
+        image, new_size, order=1, anti_aliasing=True, preserve_range=True
+    ).astype(image.dtype, copy=False)
+    
+    # Pad only the deficit if necessary
+    if new_size != tuple(target_size):
+        y_offset = (target_size[0] - new_size[0]) // 2
+        x_offset = (target_size[1] - new_size[1]) // 2
+        pad_width = ((y_offset, target_size[0] - new_size[0] - y_offset),
+                     (x_offset, target_size[1] - new_size[1] - x_offset),
+                     *[(0, 0)] * (image.ndim - 2))
+        resized = np.pad(resized, pad_width)
+    return resized
+
+def _equalize_lut(image: np.ndarray) -> np.ndarray:
+    """
+    Histogram-equalize an 8/16-bit integer image through a lookup table.
+    
+    Every integer level gets its own bin, so the equalization is a
+    bincount, a cumulative sum and one gather, with no float copy of the
+    input.
+    
+    Args:
+        image: Integer image with an itemsize of at most 2 bytes
+        
+    Returns:
+        Equalized float32 image in [0, 1]
+    """
+    lo = int(image.min())
+    if image.dtype.kind == 'i':
+        # Shift signed data (e.g. CT in HU) so the bins start at zero
+        levels = image.astype(np.int32) - lo
+    else:
+        levels = image - image.dtype.type(lo)
+    
+    hist = np.bincount(levels.ravel())
+    cdf = hist.cumsum(dtype=np.float64)
+    lut = (cdf / cdf[-1]).astype(np.float32)
+    return lut[levels]
 
 def enhance_image(
     image: np.ndarray,
@@ -86,6 +180,9 @@ def enhance_image(
     """
     Enhance image quality.
     
+    Intermediate results are kept in float32 rather than the float64
+    skimage produces by default.
+    
     Args:
         image: Input image
         contrast: Whether to enhance contrast
@@ -93,21 +190,35 @@ def enhance_image(
         sharpen: Whether to sharpen
         
     Returns:
-        Enhanced image
+        Enhanced image; the input itself if every step is disabled
     """
-    enhanced = image.copy()
+    # Each step allocates its own output, so no up-front copy is needed
+    enhanced = image
     
     if contrast:
         # Enhance contrast using histogram equalization
-        enhanced = exposure.equalize_hist(enhanced)
+        if enhanced.dtype.kind in 'ui' and enhanced.dtype.itemsize <= 2:
+            enhanced = _equalize_lut(enhanced)
+        else:
+            enhanced = exposure.equalize_hist(enhanced).astype(np.float32, copy=False)
     
     if denoise:
         # Apply Gaussian denoising
         enhanced = filters.gaussian(enhanced, sigma=1)
     
     if sharpen:
-        # Apply unsharp masking
-        enhanced = filters.unsharp_mask(enhanced, radius=1, amount=1)
+        # Apply unsharp masking, x + amount * (x - G(x)), computed inline in
+        # float32 on the (denoised) image so the one blur is reused for the
+        # difference and the sum without float64 temporaries
+        enhanced = img_as_float32(enhanced)
+        # unsharp_mask blurs with reflected borders, unlike gaussian's default
+        sharpened = filters.gaussian(enhanced, sigma=1, mode='reflect')
+        np.subtract(enhanced, sharpened, out=sharpened)
+        sharpened += enhanced
+        
+        # Clip like filters.unsharp_mask does
+        np.clip(sharpened, -1 if enhanced.min() < 0 else 0, 1, out=sharpened)
+        enhanced = sharpened
     
     return enhanced
 
@@ -128,47 +239,96 @@ def extract_patches(
         
     Returns:
         Array of patches
+        
+    Raises:
+        ValueError: If the image, patch size, stride or padding is invalid
     """
+    if image.ndim not in (2, 3):
+        raise ValueError("Image must be 2D or 3D (height, width, channels)")
+    if len(patch_size) != 2 or min(patch_size) < 1:
+        raise ValueError("Patch size must be a (height, width) pair of positive integers")
     if stride is None:
         stride = patch_size
+    if len(stride) != 2 or min(stride) < 1:
+        raise ValueError("Stride must be a (height, width) pair of positive integers")
+    if padding not in ('valid', 'same'):
+        raise ValueError(f"Unsupported padding: {padding}")
     
     h, w = image.shape[:2]
     ph, pw = patch_size
     sh, sw = stride
+    if padding == 'valid' and (ph > h or pw > w):
+        raise ValueError("Patch size is larger than the image")
     
     if padding == 'valid':
-        # Calculate number of patches
+        source = image
+        
+        # Keep every full window that fits in the image
         n_h = (h - ph) // sh + 1
         n_w = (w - pw) // sw + 1
-        
-        # Initialize patches array
-        patches = np.zeros((n_h * n_w, ph, pw, *image.shape[2:]), dtype=image.dtype)
-        
-        # Extract patches
-        for i in range(n_h):
-            for j in range(n_w):
-                patches[i * n_w + j] = image[i*sh:i*sh+ph, j*sw:j*sw+pw]
     else:  # 'same' padding
         # Calculate padding
         pad_h = ((ph - 1) // 2, ph // 2)
         pad_w = ((pw - 1) // 2, pw // 2)
         
-        # Pad image
-        padded = np.pad(image, (pad_h, pad_w, *[(0, 0)] * (len(image.shape) - 2)))
+        # Pad image; np.pad copies the image once and zero-fills only the
+        # border, and 1-pixel patches need no padding at all
+        if ph > 1 or pw > 1:
+            source = np.pad(image, (pad_h, pad_w, *[(0, 0)] * (len(image.shape) - 2)))
+        else:
+            source = image
         
         # Calculate number of patches
         n_h = h // sh
         n_w = w // sw
+    
+    # Zero-copy view of every window, strided down to the requested patches
+    windows = sliding_window_view(source, (ph, pw) + image.shape[2:])
+    windows = windows[:n_h * sh:sh, :n_w * sw:sw]
+    
+    # Materialize the patches with a single copy (the view is read-only);
+    # the reshape only drops the window's singleton channel axis
+    patches = np.empty((n_h, n_w, ph, pw, *image.shape[2:]), dtype=image.dtype)
+    patches[...] = windows.reshape(patches.shape)
+    
+    return patches.reshape(n_h * n_w, ph, pw, *image.shape[2:])
+
+def _transformed_bbox(
+    image: np.ndarray,
+    matrix: np.ndarray,
+    offset: np.ndarray
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Get the output region an affine transform can fill with non-zero content.
+    
+    Args:
+        image: Input image
+        matrix: 2x2 output->input spatial matrix
+        offset: Spatial output->input offset
         
-        # Initialize patches array
-        patches = np.zeros((n_h * n_w, ph, pw, *image.shape[2:]), dtype=image.dtype)
-        
-        # Extract patches
-        for i in range(n_h):
-            for j in range(n_w):
-                patches[i * n_w + j] = padded[i*sh:i*sh+ph, j*sw:j*sw+pw]
+    Returns:
+        Tuple of (start, stop) output pixel coordinates, or None if no
+        non-zero input lands inside the output
+    """
+    content = image != 0
+    if image.ndim > 2:
+        content = content.any(axis=tuple(range(2, image.ndim)))
+    rows = np.flatnonzero(content.any(axis=1))
+    cols = np.flatnonzero(content.any(axis=0))
+    if rows.size == 0:
+        return None
+    
+    # Map the content bbox (grown by a pixel for linear interpolation)
+    # forward into the output
+    r0, r1, c0, c1 = rows[0] - 1, rows[-1] + 1, cols[0] - 1, cols[-1] + 1
+    corners = np.array([[r0, c0], [r0, c1], [r1, c0], [r1, c1]], dtype=float)
+    corners = (corners - offset) @ np.linalg.inv(matrix).T
     
-    return patches
+    start = np.maximum(np.floor(corners.min(axis=0)).astype(int), 0)
+    stop = np.minimum(np.ceil(corners.max(axis=0)).astype(int) + 1, image.shape[:2])
+    if np.any(stop <= start):
+        return None
+    return start, stop
 
 def augment_image(
     image: np.ndarray,
@@ -192,24 +352,52 @@ def augment_image(
         brightness_range: Range for random brightness adjustment
         
     Returns:
-        Augmented image
+        Augmented image; may be the input or a view of it if no
+        interpolation or brightness change was applied
     """
-    augmented = image.copy()
+    # Compose rotation, zoom and shift about the image center as one
+    # output->input mapping so the image is interpolated only once
+    spatial = np.eye(2)
+    shift = np.zeros(2)
     
     # Random rotation
     if rotation_range[0] != 0 or rotation_range[1] != 0:
-        angle = np.random.uniform(*rotation_range)
-        augmented = ndimage.rotate(augmented, angle, reshape=False)
+        angle = np.deg2rad(np.random.uniform(*rotation_range))
+        cos, sin = np.cos(angle), np.sin(angle)
+        spatial = np.array([[cos, -sin], [sin, cos]]) @ spatial
     
     # Random shift
     if shift_range[0] != 0 or shift_range[1] != 0:
-        shift = [np.random.uniform(*shift_range) * s for s in augmented.shape[:2]]
-        augmented = ndimage.shift(augmented, shift)
+        shift = np.array([np.random.uniform(*shift_range) * s for s in image.shape[:2]])
     
     # Random zoom
     if zoom_range[0] != 1 or zoom_range[1] != 1:
         zoom = np.random.uniform(*zoom_range)
-        augmented = ndimage.zoom(augmented, (zoom, zoom, *[1] * (len(augmented.shape) - 2)))
+        spatial = spatial / zoom
+    
+    if np.any(spatial != np.eye(2)) or np.any(shift != 0):
+        # Trailing (channel) axes are mapped through unchanged
+        matrix = np.eye(image.ndim)
+        matrix[:2, :2] = spatial
+        center = np.zeros(image.ndim)
+        center[:2] = (np.array(image.shape[:2]) - 1) / 2
+        translation = np.zeros(image.ndim)
+        translation[:2] = shift
+        offset = center - matrix @ (center + translation)
+        
+        # Only output pixels that can see non-zero input need interpolating;
+        # the zero border of a slice maps to zero anyway
+        augmented = np.zeros_like(image)
+        region = _transformed_bbox(image, spatial, offset[:2])
+        if region is not None:
+            (r0, c0), (r1, c1) = region
+            augmented[r0:r1, c0:c1] = ndimage.affine_transform(
+                image, matrix, offset=offset + matrix[:, :2] @ (r0, c0),
+                output_shape=(r1 - r0, c1 - c0, *image.shape[2:]),
+                order=1, mode='constant'
+            )
+    else:
+        augmented = image
     
     # Random flips
     if flip_horizontal and np.random.random() < 0.5:
@@ -222,4 +410,84 @@ def augment_image(
         factor = np.random.uniform(*brightness_range)
         augmented = augmented * factor
     
-    return augmented 
\ No newline at end of file
+    return augmented 
+
+def augment_batch(
+    images: Union[np.ndarray, tf.Tensor],
+    rotation_range: Tuple[float, float] = (-10, 10),
+    shift_range: Tuple[float, float] = (-0.1, 0.1),
+    zoom_range: Tuple[float, float] = (0.9, 1.1),
+    flip_horizontal: bool = True,
+    flip_vertical: bool = True,
+    brightness_range: Tuple[float, float] = (0.8, 1.2),
+    fill_mode: str = 'constant'
+) -> tf.Tensor:
+    """
+    Apply random augmentations to a batch of images on the TensorFlow device.
+    
+    Rotation, shift, zoom and flips are composed into one affine transform
+    per sample and the whole batch is resampled by a single bilinear
+    ImageProjectiveTransform op, so it runs on the GPU when one is present
+    and can be used inside a tf.data map. augment_image remains the
+    per-image NumPy equivalent.
+    
+    Args:
+        images: Batch of images with shape (batch, height, width, channels)
+        rotation_range: Range for random rotation in degrees
+        shift_range: Range for random shift as a fraction of the image size
+        zoom_range: Range for random zoom
+        flip_horizontal: Whether to allow horizontal flips
+        flip_vertical: Whether to allow vertical flips
+        brightness_range: Range for random brightness adjustment
+        fill_mode: How to fill points outside the input ('constant',
+            'nearest', 'reflect' or 'wrap')
+        
+    Returns:
+        Augmented batch as a float32 tensor
+    """
+    images = tf.convert_to_tensor(images, dtype=tf.float32)
+    shape = tf.shape(images)
+    n = shape[0]
+    height = tf.cast(shape[1], tf.float32)
+    width = tf.cast(shape[2], tf.float32)
+    
+    # Per-sample random parameters
+    angle = tf.random.uniform([n], *rotation_range) * (np.pi / 180)
+    zoom = tf.random.uniform([n], *zoom_range)
+    tx = tf.random.uniform([n], *shift_range) * width
+    ty = tf.random.uniform([n], *shift_range) * height
+    sx = tf.ones([n])
+    sy = tf.ones([n])
+    if flip_horizontal:
+        sx = tf.where(tf.random.uniform([n]) < 0.5, -sx, sx)
+    if flip_vertical:
+        sy = tf.where(tf.random.uniform([n]) < 0.5, -sy, sy)
+    
+    # Output->input mapping: flip about the center, undo the shift, then
+    # rotate and zoom about the center
+    cos = tf.cos(angle) / zoom
+    sin = tf.sin(angle) / zoom
+    cx = (width - 1) / 2
+    cy = (height - 1) / 2
+    a0, a1 = cos * sx, -sin * sy
+    b0, b1 = sin * sx, cos * sy
+    a2 = cx - a0 * cx - a1 * cy - (cos * tx - sin * ty)
+    b2 = cy - b0 * cx - b1 * cy - (sin * tx + cos * ty)
+    zeros = tf.zeros([n])
+    transforms = tf.stack([a0, a1, a2, b0, b1, b2, zeros, zeros], axis=1)
+    
+    augmented = tf.raw_ops.ImageProjectiveTransformV3(
+        images=images,
+        transforms=transforms,
+        output_shape=shape[1:3],
+        fill_value=0.0,
+        interpolation='BILINEAR',
+        fill_mode=fill_mode.upper()
+    )
+    
+    # Random brightness
+    if brightness_range[0] != 1 or brightness_range[1] != 1:
+        factor = tf.random.uniform([n, 1, 1, 1], *brightness_range)
+        augmented = augmented * factor
+    
+    return augmented
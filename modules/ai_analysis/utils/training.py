@@ -3,11 +3,49 @@ Training utilities for AI analysis.
 """
 
 import numpy as np
+import tensorflow as tf
 from typing import Tuple, Optional, Dict, Any
 from tensorflow.keras.models import Model
 from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping, ReduceLROnPlateau
 from tensorflow.keras.utils import to_categorical
 
+def _training_dataset(
+    X: np.ndarray,
+    y: np.ndarray,
+    batch_size: int,
+    shuffle: bool = True
+) -> tf.data.Dataset:
+    """
+    Wrap arrays in a cached, shuffled, batched and prefetched dataset.
+    
+    The slices are cached before shuffling so every epoch gets a fresh
+    order, and prefetching overlaps preparing the next batch with the
+    current training step. Ordering is relaxed since training does not
+    depend on it.
+    
+    Args:
+        X: Input data
+        y: Labels
+        batch_size: Batch size
+        shuffle: Whether to reshuffle every epoch
+        
+    Returns:
+        Dataset yielding (X, y) batches
+    """
+    options = tf.data.Options()
+    options.deterministic = False
+    options.experimental_optimization.map_and_batch_fusion = True
+    
+    dataset = tf.data.Dataset.from_tensor_slices((X, y)).cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(X), reshuffle_each_iteration=True)
+    return (
+        dataset
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+        .with_options(options)
+    )
+
 def train_model(
     model: Model,
     X_train: np.ndarray,
@@ -63,14 +101,21 @@ def train_model(
     if callbacks:
         default_callbacks.extend(callbacks)
     
+    # Datasets do not support validation_split, so hold out the tail of the
+    # training data the same way Keras does for arrays
+    if X_val is None and validation_split:
+        split = int(len(X_train) * (1 - validation_split))
+        X_train, X_val = X_train[:split], X_train[split:]
+        y_train, y_val = y_train[:split], y_train[split:]
+    
     # Train the model
     history = model.fit(
-        X_train,
-        y_train,
-        batch_size=batch_size,
+        _training_dataset(X_train, y_train, batch_size),
         epochs=epochs,
-        validation_data=(X_val, y_val) if X_val is not None else None,
-        validation_split=validation_split if X_val is None else None,
+        validation_data=(
+            _training_dataset(X_val, y_val, batch_size, shuffle=False)
+            if X_val is not None else None
+        ),
         class_weight=class_weights,
         callbacks=default_callbacks,
         verbose=1
@@ -83,6 +128,32 @@ def train_model(
         'best_loss': np.min(history.history['val_loss'])
     }
 
+def _inference_dataset(
+    X: np.ndarray,
+    y: Optional[np.ndarray] = None,
+    batch_size: int = 32
+) -> tf.data.Dataset:
+    """
+    Wrap arrays in a batched, prefetched dataset for inference.
+    
+    Prefetching lets the host-to-device copy of the next batch overlap
+    with the current one instead of handing Keras the whole array.
+    
+    Args:
+        X: Input data
+        y: Optional labels
+        batch_size: Batch size
+        
+    Returns:
+        Dataset yielding X batches, or (X, y) batches if y is given
+    """
+    tensors = X if y is None else (X, y)
+    return (
+        tf.data.Dataset.from_tensor_slices(tensors)
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
 def evaluate_model(
     model: Model,
     X_test: np.ndarray,
@@ -102,10 +173,12 @@ def evaluate_model(
         Dictionary containing evaluation metrics
     """
     # Evaluate the model
-    loss, *metrics = model.evaluate(X_test, y_test, batch_size=batch_size, verbose=0)
+    loss, *metrics = model.evaluate(
+        _inference_dataset(X_test, y_test, batch_size), verbose=0
+    )
     
     # Get predictions
-    y_pred = model.predict(X_test, batch_size=batch_size)
+    y_pred = model.predict(_inference_dataset(X_test, batch_size=batch_size), verbose=0)
     
     # Calculate additional metrics
     results = {
@@ -145,7 +218,7 @@ def predict_batch(
     Returns:
         Model predictions
     """
-    predictions = model.predict(X, batch_size=batch_size)
+    predictions = model.predict(_inference_dataset(X, batch_size=batch_size), verbose=0)
     
     # Apply threshold for binary classification
     if model.output_shape[-1] == 1:
@@ -0,0 +1,235 @@
+"""
+TensorRT utilities for Medical 3D Viewer.
+Provides functions for compiling Keras models into cached TF-TRT engines.
+"""
+
+import os
+import re
+import hashlib
+import tempfile
+import functools
+import logging
+from typing import Callable, Sequence, Tuple
+import tensorflow as tf
+from config import TRT_ENGINE_PATH, TRT_PRECISION, TRT_PROFILE_BATCH_SIZES
+from ..data.generator import generate_synthetic_data
+
+try:
+    from tensorflow.python.compiler.tensorrt import trt_convert as trt
+    TRT_AVAILABLE = tf.test.is_built_with_cuda()
+except ImportError:
+    trt = None
+    TRT_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("FP32", "FP16", "INT8")
+
+class TRTEngineError(Exception):
+    """Custom exception for TensorRT engine errors."""
+    pass
+
+@functools.lru_cache(maxsize=16)
+def _content_hash(path: str, mtime_ns: int, size: int) -> str:
+    """Hash a model file's contents; cached per path, modification time and size."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def _file_hash(path: str) -> str:
+    """Get a short content hash of a model file, rehashing only after it changes."""
+    stat = os.stat(path)
+    return _content_hash(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+def _gpu_name() -> str:
+    """Get a filesystem-safe name for the first GPU."""
+    gpus = tf.config.list_physical_devices('GPU')
+    if not gpus:
+        return "cpu"
+    name = tf.config.experimental.get_device_details(gpus[0]).get('device_name', 'gpu')
+    return re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower()
+
+def engine_dir(model_path: str, precision: str = TRT_PRECISION) -> str:
+    """
+    Get the engine cache directory for a model file.
+    
+    Engines are specific to the weights, the GPU they were built on, their
+    precision and the batch sizes they were profiled for, so the directory
+    is keyed by the model's content hash, the device name, the precision
+    mode and the profile's largest batch.
+    """
+    model_name = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(
+        TRT_ENGINE_PATH,
+        f"{model_name}_{_file_hash(model_path)}_{_gpu_name()}_{precision.lower()}"
+        f"_b{max(TRT_PROFILE_BATCH_SIZES)}"
+    )
+
+def _calibration_input_fn(
+    input_shape: Tuple[int, ...],
+    num_samples: int = 512,
+    batch_size: int = 32
+) -> Callable:
+    """Build an INT8 calibration input function from synthetic samples."""
+    X, _ = generate_synthetic_data(
+        num_samples, image_size=input_shape[:2], num_channels=input_shape[2]
+    )
+    
+    def input_fn():
+        for start in range(0, num_samples, batch_size):
+            yield (tf.constant(X[start:start + batch_size]),)
+    
+    return input_fn
+
+def _wrap_signature(fn) -> Callable[[tf.Tensor], tf.Tensor]:
+    """Turn a single-input, single-output serving signature into a plain callable."""
+    input_name = next(iter(fn.structured_input_signature[1]))
+    output_name = next(iter(fn.structured_outputs))
+    return lambda x: fn(**{input_name: tf.cast(x, tf.float32)})[output_name]
+
+def build_trt_engine(
+    model: tf.keras.Model,
+    output_dir: str,
+    batch_sizes: Sequence[int] = TRT_PROFILE_BATCH_SIZES,
+    precision: str = TRT_PRECISION
+) -> None:
+    """
+    Compile a Keras model into a TF-TRT SavedModel.
+    
+    FP16 and INT8 let TensorRT pick Tensor Core kernels for the conv
+    layers; INT8 ranges are calibrated on synthetic samples shaped like
+    the model input.
+    
+    Engines are built ahead of time for one batch of each size with the
+    "Range+Optimal" profile strategy: TensorRT gets one optimization profile
+    spanning the smallest to the largest batch plus one tuned for each
+    size, and picks the profile matching each call's batch at run time.
+    
+    Args:
+        model: The Keras model to compile
+        output_dir: Directory to save the compiled model to
+        batch_sizes: Batch sizes to build engines for, smallest to largest
+            (default: the min, opt and max batch from config)
+        precision: Engine precision, one of "FP32", "FP16" or "INT8"
+    
+    Raises:
+        ValueError: If precision is not supported
+        TRTEngineError: If TensorRT is unavailable or conversion fails
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision}")
+    if not TRT_AVAILABLE:
+        raise TRTEngineError("TensorRT is not available")
+    
+    try:
+        spec = tf.TensorSpec([None, *model.input_shape[1:]], tf.float32, name='x')
+        serving = tf.function(lambda x: model(x, training=False)).get_concrete_function(spec)
+        
+        # TF-TRT converts from a SavedModel, written to a scratch directory
+        # that is removed once the engine is saved
+        with tempfile.TemporaryDirectory() as source_dir:
+            tf.saved_model.save(model, source_dir, signatures=serving)
+            _convert(model, source_dir, output_dir, batch_sizes, precision)
+        
+        logger.info(f"Saved TensorRT engine to {output_dir}")
+    except Exception as e:
+        logger.error(f"Failed to build TensorRT engine: {str(e)}")
+        raise TRTEngineError(f"Failed to build TensorRT engine: {str(e)}")
+
+def _convert(
+    model: tf.keras.Model,
+    source_dir: str,
+    output_dir: str,
+    batch_sizes: Sequence[int],
+    precision: str
+) -> None:
+    """Convert a SavedModel with TF-TRT, build its engines and save the result."""
+    converter = trt.TrtGraphConverterV2(
+        input_saved_model_dir=source_dir,
+        conversion_params=trt.TrtConversionParams(
+            precision_mode=getattr(trt.TrtPrecisionMode, precision),
+            max_workspace_size_bytes=1 << 30,
+            use_calibration=precision == "INT8"
+        ),
+        use_dynamic_shape=True,
+        dynamic_shape_profile_strategy='Range+Optimal'
+    )
+    if precision == "INT8":
+        converter.convert(
+            calibration_input_fn=_calibration_input_fn(tuple(model.input_shape[1:]))
+        )
+    else:
+        converter.convert()
+    
+    # Build the engines now so the first prediction does not pay for it
+    def input_fn():
+        for batch_size in batch_sizes:
+            yield (tf.zeros((batch_size, *model.input_shape[1:]), tf.float32),)
+    
+    converter.build(input_fn=input_fn)
+    converter.save(output_dir)
+
+def load_trt_inference_fn(
+    model: tf.keras.Model,
+    model_path: str,
+    precision: str = TRT_PRECISION
+) -> Callable[[tf.Tensor], tf.Tensor]:
+    """
+    Get a TensorRT inference function for a Keras model file.
+    
+    The engine is loaded from the cache when one exists for this model file,
+    GPU and precision, and built and cached otherwise.
+    
+    Args:
+        model: The loaded Keras model
+        model_path: Path to the model's .h5 file
+        precision: Engine precision, one of "FP32", "FP16" or "INT8"
+    
+    Returns:
+        Function mapping a float32 NHWC batch to the model output
+    
+    Raises:
+        TRTEngineError: If the engine cannot be built or loaded
+    """
+    if not TRT_AVAILABLE:
+        raise TRTEngineError("TensorRT is not available")
+    
+    output_dir = engine_dir(model_path, precision)
+    if not os.path.exists(os.path.join(output_dir, 'saved_model.pb')):
+        build_trt_engine(model, output_dir, precision=precision)
+    
+    return _load_engine(output_dir)
+
+def _warm_up(fn, batch_sizes: Sequence[int] = TRT_PROFILE_BATCH_SIZES) -> None:
+    """
+    Run a serving signature once for each profiled batch size.
+    
+    The first call on each shape creates the TensorRT execution context
+    for its profile and allocates device buffers; doing it at load time
+    keeps that cost out of the first real predictions.
+    """
+    spec = next(iter(fn.structured_input_signature[1].values()))
+    for batch_size in batch_sizes:
+        _wrap_signature(fn)(tf.zeros((batch_size, *spec.shape[1:]), tf.float32))
+
+@functools.lru_cache(maxsize=4)
+def _load_engine(output_dir: str) -> Callable[[tf.Tensor], tf.Tensor]:
+    """Deserialize and warm up a saved TF-TRT model once per engine directory."""
+    try:
+        loaded = tf.saved_model.load(output_dir)
+        serving = loaded.signatures['serving_default']
+        _warm_up(serving)
+        infer = _wrap_signature(serving)
+        # Keep the loaded object alive as long as the function is used
+        infer.saved_model = loaded
+        return infer
+    except Exception as e:
+        logger.error(f"Failed to load TensorRT engine: {str(e)}")
+        raise TRTEngineError(f"Failed to load TensorRT engine: {str(e)}")
+
+def clear_trt_cache() -> None:
+    """Drop all loaded TensorRT engines."""
+    _load_engine.cache_clear()
@@ -1,4 +1,7 @@
+import math
+import numpy as np
 import vtk
+from utils.jit import njit, prange, NUMBA_AVAILABLE
 
 def create_annotation(point):
     """ Create a text annotation at a specific point. """
@@ -8,6 +11,34 @@ def create_annotation(point):
     text_actor.GetTextProperty().SetFontSize(20)
     return text_actor
 
+@njit(cache=True, fastmath=True)
+def _dist3(p1, p2):
+    """ Euclidean distance between two 3D points. """
+    return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2 + (p1[2] - p2[2])**2)
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _pairwise_distances(points):
+    """ Distance matrix for an (N, 3) float64 array, one row per thread. """
+    n = points.shape[0]
+    out = np.empty((n, n), dtype=np.float64)
+    for i in prange(n):
+        out[i, i] = 0.0
+        for j in range(i + 1, n):
+            d = _dist3(points[i], points[j])
+            out[i, j] = d
+            out[j, i] = d
+    return out
+
 def measure_distance(p1, p2):
-    """ Measure distance between two points. """
-    return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2 + (p1[2] - p2[2])**2) ** 0.5
+    """ Measure distance between two points; use pairwise_distances for many points. """
+    return math.dist(p1, p2)
+
+def pairwise_distances(points):
+    """ Measure distances between every pair of (N, 3) points, returned as an (N, N) array. """
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("Points must be an (N, 3) array")
+    if NUMBA_AVAILABLE:
+        return _pairwise_distances(points)
+    diff = points[:, None, :] - points[None, :, :]
+    return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
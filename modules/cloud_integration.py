@@ -4,11 +4,14 @@ Cloud integration module for handling file uploads to AWS S3 and Firebase Storag
 
 import os
 import logging
+import threading
 from typing import Optional
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 import firebase_admin
 from firebase_admin import storage, credentials
+from google.cloud.storage.retry import DEFAULT_RETRY
 from config import AWS_CONFIG, FIREBASE_CONFIG
 
 # Configure logging
@@ -18,15 +21,50 @@ class CloudUploadError(Exception):
     """Custom exception for cloud upload errors."""
     pass
 
+# Clients are created once and reused so each call does not re-resolve
+# credentials and open a new connection pool
+_s3 = None
+_bucket = None
+_client_lock = threading.Lock()
+
+# Large studies are uploaded as concurrent 16 MB parts
+_CHUNK_SIZE = 16 * 1024 * 1024
+# Seconds each chunk request may take before it is retried
+_CHUNK_TIMEOUT = 120
+_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=_CHUNK_SIZE,
+    max_concurrency=8,
+    use_threads=True
+)
+
+def _get_s3():
+    """Get the shared S3 client, creating it on first use."""
+    global _s3
+    if _s3 is None:
+        with _client_lock:
+            if _s3 is None:
+                _s3 = boto3.client(
+                    "s3",
+                    region_name=AWS_CONFIG["region_name"],
+                    endpoint_url=AWS_CONFIG["endpoint_url"]
+                )
+    return _s3
+
+def _get_bucket():
+    """Get the shared Firebase Storage bucket, resolving it on first use."""
+    global _bucket
+    if _bucket is None:
+        with _client_lock:
+            if _bucket is None:
+                _bucket = storage.bucket(FIREBASE_CONFIG["storage_bucket"])
+    return _bucket
+
 def initialize_cloud_services() -> None:
     """Initialize cloud services with proper credentials."""
     try:
         # Initialize AWS S3 client
-        s3 = boto3.client(
-            "s3",
-            region_name=AWS_CONFIG["region_name"],
-            endpoint_url=AWS_CONFIG["endpoint_url"]
-        )
+        _get_s3()
         
         # Initialize Firebase
         if not firebase_admin._apps:
@@ -59,14 +97,14 @@ def upload_to_s3(file_path: str, object_name: Optional[str] = None) -> str:
         raise CloudUploadError(f"File not found: {file_path}")
         
     try:
-        s3 = boto3.client("s3")
+        s3 = _get_s3()
         bucket_name = AWS_CONFIG["bucket_name"]
         
         if object_name is None:
             object_name = os.path.basename(file_path)
             
         logger.info(f"Uploading {file_path} to S3 bucket {bucket_name}")
-        s3.upload_file(file_path, bucket_name, object_name)
+        s3.upload_file(file_path, bucket_name, object_name, Config=_S3_TRANSFER_CONFIG)
         
         url = f"https://{bucket_name}.s3.amazonaws.com/{object_name}"
         logger.info(f"Successfully uploaded to S3: {url}")
@@ -99,15 +137,17 @@ def upload_to_firebase(file_path: str, object_name: Optional[str] = None) -> str
         raise CloudUploadError(f"File not found: {file_path}")
         
     try:
-        bucket = storage.bucket(FIREBASE_CONFIG["storage_bucket"])
+        bucket = _get_bucket()
         
         if object_name is None:
             object_name = os.path.basename(file_path)
             
-        blob = bucket.blob(object_name)
+        # Resumable upload in 16 MB chunks so a failed request only resends
+        # one chunk; a stalled chunk times out and is retried with backoff
+        blob = bucket.blob(object_name, chunk_size=_CHUNK_SIZE)
         logger.info(f"Uploading {file_path} to Firebase Storage")
         
-        blob.upload_from_filename(file_path)
+        blob.upload_from_filename(file_path, timeout=_CHUNK_TIMEOUT, retry=DEFAULT_RETRY)
         url = blob.public_url
         
         logger.info(f"Successfully uploaded to Firebase: {url}")
@@ -129,7 +169,7 @@ def delete_from_s3(object_name: str) -> None:
         CloudUploadError: If deletion fails
     """
     try:
-        s3 = boto3.client("s3")
+        s3 = _get_s3()
         bucket_name = AWS_CONFIG["bucket_name"]
         
         logger.info(f"Deleting {object_name} from S3 bucket {bucket_name}")
@@ -152,7 +192,7 @@ def delete_from_firebase(object_name: str) -> None:
         CloudUploadError: If deletion fails
     """
     try:
-        bucket = storage.bucket(FIREBASE_CONFIG["storage_bucket"])
+        bucket = _get_bucket()
         blob = bucket.blob(object_name)
         
         logger.info(f"Deleting {object_name} from Firebase Storage")
@@ -5,8 +5,11 @@ Provides functions for loading and processing DICOM image files.
 
 import os
 import logging
-from typing import Optional, Tuple, Dict, Any, List
+import functools
+from typing import Optional, Tuple, Dict, Any, List, Union
+import numpy as np
 import vtk
+from vtkmodules.util.numpy_support import vtk_to_numpy
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,6 +18,102 @@ class DicomLoadError(Exception):
     """Custom exception for DICOM loading errors."""
     pass
 
+@functools.lru_cache(maxsize=8)
+def _read_dicom_cached(directory: str, mtime_ns: int) -> vtk.vtkDICOMImageReader:
+    """Read a DICOM series; cached per directory and modification time."""
+    reader = vtk.vtkDICOMImageReader()
+    reader.SetDirectoryName(directory)
+    reader.Update()
+    return reader
+
+def _read_dicom(directory: str) -> vtk.vtkDICOMImageReader:
+    """
+    Get an updated DICOM reader for a directory, reusing a previous read.
+    
+    The cache key includes the directory's modification time, so adding or
+    removing files triggers a fresh read.
+    
+    Args:
+        directory: Directory containing DICOM files
+        
+    Returns:
+        The updated vtkDICOMImageReader
+    """
+    return _read_dicom_cached(os.path.abspath(directory), os.stat(directory).st_mtime_ns)
+
+def clear_dicom_cache() -> None:
+    """Drop all cached DICOM reads."""
+    _read_dicom_cached.cache_clear()
+
+def _source_algorithm(volume: vtk.vtkVolume) -> vtk.vtkAlgorithm:
+    """
+    Get the algorithm producing a volume's raw voxels.
+    
+    Volumes from load_dicom keep their reader, so analysis and extraction
+    see the original intensities even when the mapper is fed windowed 8-bit
+    scalars; for other volumes the mapper's input algorithm is used.
+    """
+    reader = getattr(volume, "_dicom_reader", None)
+    if reader is not None:
+        return reader
+    return volume.GetMapper().GetInputAlgorithm()
+
+@functools.lru_cache(maxsize=32)
+def _make_transfer_functions(
+    window_width: float,
+    window_center: float,
+    opacity: float,
+    color_table: Optional[Tuple[Tuple[float, Tuple[float, float, float]], ...]],
+    downcast: bool
+) -> Tuple[vtk.vtkColorTransferFunction, vtk.vtkPiecewiseFunction]:
+    """
+    Build the color and opacity transfer functions for a window.
+    
+    Results are cached and shared between volumes, so callers must not
+    modify the returned functions.
+    
+    Args:
+        window_width: Window width for intensity mapping
+        window_center: Window center for intensity mapping
+        opacity: Opacity of the volume
+        color_table: Tuple of (intensity, RGB) pairs for custom color mapping
+        downcast: Whether the mapper sees the windowed 8-bit scalars
+        
+    Returns:
+        Tuple of (color transfer function, opacity transfer function)
+    """
+    if downcast:
+        lower, scale = window_center - window_width/2, 255.0 / window_width
+    else:
+        lower, scale = 0.0, 1.0
+        
+    def to_scalar(intensity):
+        """Map an intensity onto the scalars the mapper sees."""
+        return (intensity - lower) * scale
+        
+    # Set color transfer function
+    color = vtk.vtkColorTransferFunction()
+    if color_table:
+        for intensity, rgb in color_table:
+            color.AddRGBPoint(to_scalar(intensity), *rgb)
+    else:
+        # Default color mapping
+        color.AddRGBPoint(to_scalar(-1000), 0.0, 0.0, 0.0)
+        color.AddRGBPoint(to_scalar(window_center - window_width/2), 0.0, 0.0, 0.0)
+        color.AddRGBPoint(to_scalar(window_center), 0.5, 0.5, 0.5)
+        color.AddRGBPoint(to_scalar(window_center + window_width/2), 1.0, 1.0, 1.0)
+        color.AddRGBPoint(to_scalar(1000), 1.0, 1.0, 1.0)
+        
+    # Set opacity transfer function
+    opacity_tf = vtk.vtkPiecewiseFunction()
+    opacity_tf.AddPoint(to_scalar(-1000), 0.0)
+    opacity_tf.AddPoint(to_scalar(window_center - window_width/2), 0.0)
+    opacity_tf.AddPoint(to_scalar(window_center), opacity)
+    opacity_tf.AddPoint(to_scalar(window_center + window_width/2), opacity)
+    opacity_tf.AddPoint(to_scalar(1000), opacity)
+    
+    return color, opacity_tf
+
 def load_dicom(
     directory: str,
     window_width: float = 400,
@@ -22,7 +121,8 @@ def load_dicom(
     color_table: Optional[List[Tuple[float, Tuple[float, float, float]]]] = None,
     opacity: float = 1.0,
     shade: bool = True,
-    interpolation: str = "linear"
+    interpolation: str = "linear",
+    downcast: bool = False
 ) -> vtk.vtkVolume:
     """
     Load DICOM files from a directory and return a VTK volume.
@@ -35,6 +135,9 @@ def load_dicom(
         opacity: Opacity of the volume (0.0 to 1.0, default: 1.0)
         shade: Whether to enable shading (default: True)
         interpolation: Interpolation method ("linear" or "nearest", default: "linear")
+        downcast: Whether to apply the window on load and upload the volume as
+            8-bit voxels, which quarters GPU texture memory for 32-bit data and
+            halves it for 16-bit data (default: False)
         
     Returns:
         The VTK volume containing the loaded DICOM data
@@ -51,18 +154,30 @@ def load_dicom(
     if interpolation not in ["linear", "nearest"]:
         raise ValueError("Invalid interpolation method")
         
+    if window_width <= 0:
+        raise ValueError("Window width must be positive")
+        
     try:
         logger.info(f"Loading DICOM files from {directory}")
         
-        # Create DICOM reader
-        reader = vtk.vtkDICOMImageReader()
-        reader.SetDirectoryName(directory)
-        reader.Update()
+        # Get DICOM reader
+        reader = _read_dicom(directory)
         
         # Create volume mapper
         volume_mapper = vtk.vtkGPUVolumeRayCastMapper()
-        volume_mapper.SetInputConnection(reader.GetOutputPort())
-        
+        if downcast:
+            # Map the window onto [0, 255] and clamp everything outside it
+            cast = vtk.vtkImageShiftScale()
+            cast.SetInputConnection(reader.GetOutputPort())
+            cast.SetShift(-(window_center - window_width/2))
+            cast.SetScale(255.0 / window_width)
+            cast.SetOutputScalarTypeToUnsignedChar()
+            cast.ClampOverflowOn()
+            cast.Update()
+            volume_mapper.SetInputConnection(cast.GetOutputPort())
+        else:
+            volume_mapper.SetInputConnection(reader.GetOutputPort())
+            
         # Create volume property
         volume_property = vtk.vtkVolumeProperty()
         volume_property.SetShade(shade)
@@ -72,28 +187,16 @@ def load_dicom(
         else:
             volume_property.SetInterpolationTypeToNearest()
             
-        # Set color transfer function
-        color = vtk.vtkColorTransferFunction()
-        if color_table:
-            for intensity, rgb in color_table:
-                color.AddRGBPoint(intensity, *rgb)
-        else:
-            # Default color mapping
-            color.AddRGBPoint(-1000, 0.0, 0.0, 0.0)
-            color.AddRGBPoint(window_center - window_width/2, 0.0, 0.0, 0.0)
-            color.AddRGBPoint(window_center, 0.5, 0.5, 0.5)
-            color.AddRGBPoint(window_center + window_width/2, 1.0, 1.0, 1.0)
-            color.AddRGBPoint(1000, 1.0, 1.0, 1.0)
-            
+        # Set color and opacity transfer functions, shared between loads
+        # with the same window settings
+        color, opacity_tf = _make_transfer_functions(
+            window_width,
+            window_center,
+            opacity,
+            tuple((intensity, tuple(rgb)) for intensity, rgb in color_table) if color_table else None,
+            downcast
+        )
         volume_property.SetColor(color)
-        
-        # Set opacity transfer function
-        opacity_tf = vtk.vtkPiecewiseFunction()
-        opacity_tf.AddPoint(-1000, 0.0)
-        opacity_tf.AddPoint(window_center - window_width/2, 0.0)
-        opacity_tf.AddPoint(window_center, opacity)
-        opacity_tf.AddPoint(window_center + window_width/2, opacity)
-        opacity_tf.AddPoint(1000, opacity)
         volume_property.SetScalarOpacity(opacity_tf)
         
         # Create volume
@@ -101,6 +204,9 @@ def load_dicom(
         volume.SetMapper(volume_mapper)
         volume.SetProperty(volume_property)
         
+        # Keep the reader for raw-intensity slice extraction
+        volume._dicom_reader = reader
+        
         logger.debug("DICOM volume loaded successfully")
         return volume
         
@@ -108,6 +214,36 @@ def load_dicom(
         logger.error(f"Failed to load DICOM: {str(e)}")
         raise DicomLoadError(f"Failed to load DICOM: {str(e)}")
 
+def get_dicom_array(directory: str) -> np.ndarray:
+    """
+    Get the voxels of a DICOM series as a NumPy array.
+    
+    The array is a read-only view of the cached reader's scalars, so no
+    voxel data is copied.
+    
+    Args:
+        directory: Directory containing DICOM files
+        
+    Returns:
+        The volume as an array of shape (slices, rows, columns)
+        
+    Raises:
+        DicomLoadError: If files cannot be loaded
+    """
+    if not os.path.exists(directory):
+        raise DicomLoadError(f"Directory not found: {directory}")
+        
+    try:
+        image_data = _read_dicom(directory).GetOutput()
+        nx, ny, nz = image_data.GetDimensions()
+        voxels = vtk_to_numpy(image_data.GetPointData().GetScalars()).reshape(nz, ny, nx)
+        voxels.flags.writeable = False
+        return voxels
+        
+    except Exception as e:
+        logger.error(f"Failed to read DICOM voxels: {str(e)}")
+        raise DicomLoadError(f"Failed to read DICOM voxels: {str(e)}")
+
 def get_dicom_info(directory: str) -> Dict[str, Any]:
     """
     Get information about DICOM files in a directory.
@@ -125,10 +261,8 @@ def get_dicom_info(directory: str) -> Dict[str, Any]:
         raise DicomLoadError(f"Directory not found: {directory}")
         
     try:
-        # Create DICOM reader
-        reader = vtk.vtkDICOMImageReader()
-        reader.SetDirectoryName(directory)
-        reader.Update()
+        # Get DICOM reader
+        reader = _read_dicom(directory)
         
         # Get image data
         image_data = reader.GetOutput()
@@ -145,9 +279,13 @@ def get_dicom_info(directory: str) -> Dict[str, Any]:
         for key in reader.GetMetaDataKeys():
             tags[key] = reader.GetMetaData(key)
             
+        # Count entries without building a list of every file name
+        with os.scandir(directory) as entries:
+            num_files = sum(1 for _ in entries)
+            
         info = {
             "directory": directory,
-            "num_files": len(os.listdir(directory)),
+            "num_files": num_files,
             "dimensions": dims,
             "spacing": spacing,
             "scalar_range": scalar_range,
@@ -164,8 +302,9 @@ def get_dicom_info(directory: str) -> Dict[str, Any]:
 def extract_slice(
     volume: vtk.vtkVolume,
     slice_index: int,
-    orientation: str = "axial"
-) -> vtk.vtkImageData:
+    orientation: str = "axial",
+    copy_to_host: bool = True
+) -> Union[vtk.vtkImageData, vtk.vtkImageSlice]:
     """
     Extract a 2D slice from a 3D volume.
     
@@ -173,9 +312,14 @@ def extract_slice(
         volume: The VTK volume to extract from
         slice_index: Index of the slice to extract
         orientation: Slice orientation ("axial", "sagittal", or "coronal")
+        copy_to_host: Whether to copy the slice out as image data for
+            analysis. If False, a vtkImageSlice that renders the plane
+            straight from the volume's pipeline is returned instead
+            (default: True)
         
     Returns:
-        The extracted 2D slice as vtkImageData
+        The extracted 2D slice as vtkImageData, or a vtkImageSlice for
+        display if copy_to_host is False
         
     Raises:
         ValueError: If volume is invalid or parameters are invalid
@@ -187,9 +331,30 @@ def extract_slice(
         raise ValueError("Invalid orientation")
         
     try:
-        # Get volume mapper
-        mapper = volume.GetMapper()
-        input_data = mapper.GetInput()
+        # Get the algorithm producing the raw voxels
+        source = _source_algorithm(volume)
+        
+        if not copy_to_host:
+            # Render the plane from the shared upstream data, no slab copy
+            slice_mapper = vtk.vtkImageSliceMapper()
+            slice_mapper.SetInputConnection(source.GetOutputPort())
+            if orientation == "axial":
+                slice_mapper.SetOrientationToZ()
+            elif orientation == "sagittal":
+                slice_mapper.SetOrientationToX()
+            else:  # coronal
+                slice_mapper.SetOrientationToY()
+            slice_mapper.SetSliceNumber(slice_index)
+            
+            image_slice = vtk.vtkImageSlice()
+            image_slice.SetMapper(slice_mapper)
+            image_slice.SetUserMatrix(volume.GetMatrix())
+            
+            logger.debug(f"Created {orientation} slice view at index {slice_index}")
+            return image_slice
+        
+        source.Update()
+        input_data = source.GetOutputDataObject(0)
         
         # Create extractor
         extractor = vtk.vtkExtractVOI()
@@ -215,17 +380,23 @@ def extract_slice(
 
 def create_mip(
     volume: vtk.vtkVolume,
-    direction: Tuple[float, float, float] = (0, 0, 1)
-) -> vtk.vtkImageData:
+    direction: Tuple[float, float, float] = (0, 0, 1),
+    renderer: Optional[vtk.vtkRenderer] = None
+) -> vtk.vtkVolume:
     """
     Create a maximum intensity projection (MIP) of a volume.
     
+    The projection is ray cast by a copy of the volume's own mapper switched
+    to maximum intensity blending, so it reads the same pipeline output as
+    the source volume and runs on the GPU when the source mapper does.
+    
     Args:
         volume: The VTK volume to project
         direction: Projection direction vector (default: along z-axis)
+        renderer: Optional renderer whose camera is pointed along direction
         
     Returns:
-        The MIP image as vtkImageData
+        A vtkVolume rendering the MIP of the input volume
         
     Raises:
         ValueError: If volume is invalid
@@ -234,18 +405,30 @@ def create_mip(
         raise ValueError("Invalid volume provided")
         
     try:
-        # Get volume mapper
+        # Clone the volume mapper and switch it to MIP blending
         mapper = volume.GetMapper()
-        input_data = mapper.GetInput()
-        
-        # Create MIP filter
-        mip = vtk.vtkProjectedTexture()
-        mip.SetInputData(input_data)
-        mip.SetProjectionDirection(*direction)
-        mip.Update()
+        mip_mapper = mapper.NewInstance()
+        mip_mapper.ShallowCopy(mapper)
+        mip_mapper.SetInputConnection(mapper.GetInputConnection(0, 0))
+        mip_mapper.SetBlendModeToMaximumIntensity()
+        
+        # Create MIP volume sharing the source appearance and placement
+        mip = vtk.vtkVolume()
+        mip.SetMapper(mip_mapper)
+        mip.SetProperty(volume.GetProperty())
+        mip.SetUserMatrix(volume.GetMatrix())
+        
+        # Look along the projection direction
+        if renderer is not None:
+            camera = renderer.GetActiveCamera()
+            focal_point = mip.GetCenter()
+            camera.SetFocalPoint(*focal_point)
+            camera.SetPosition(*[f - d for f, d in zip(focal_point, direction)])
+            camera.OrthogonalizeViewUp()
+            renderer.ResetCamera(mip.GetBounds())
         
         logger.debug("Created maximum intensity projection")
-        return mip.GetOutput()
+        return mip
         
     except Exception as e:
         logger.error(f"Failed to create MIP: {str(e)}")
@@ -4,7 +4,8 @@ Provides functions for handling user interactions with the 3D scene.
 """
 
 import logging
-from typing import List, Tuple, Optional, Union
+from typing import Callable, List, Tuple, Optional, Union
+import numpy as np
 import vtk
 from vtkmodules.vtkCommonCore import vtkObject
 from vtkmodules.vtkRenderingCore import vtkActor, vtkVolume
@@ -51,11 +52,152 @@ def set_interaction_style(
         logger.error(f"Failed to set interaction style: {str(e)}")
         raise InteractionError(f"Failed to set interaction style: {str(e)}")
 
+def enable_deferred_rendering(
+    interactor: vtk.vtkRenderWindowInteractor
+) -> Callable[[], None]:
+    """
+    Defer interactive rendering to a caller-driven tick.
+    
+    Render requests from the interactor style (one per mouse move during
+    rotate/pan/zoom) only mark the view dirty; the returned tick renders
+    if the view is dirty, so calling it from a repeating timer coalesces
+    bursts of motion events and caps the render rate at the timer rate.
+    Must be called after the interactor is initialized.
+    
+    Args:
+        interactor: The VTK interactor to drive
+        
+    Returns:
+        A callable that renders once if a render was requested since the
+        previous call
+        
+    Raises:
+        ValueError: If interactor is invalid
+    """
+    if not isinstance(interactor, vtk.vtkRenderWindowInteractor):
+        raise ValueError("Invalid interactor provided")
+        
+    try:
+        render_window = interactor.GetRenderWindow()
+        dirty = [False]
+        
+        def on_render_request(obj, event):
+            dirty[0] = True
+            
+        def tick():
+            if dirty[0]:
+                dirty[0] = False
+                render_window.Render()
+                
+        # The interactor still fires RenderEvent when its own rendering is
+        # disabled, so requests can be deferred to the tick
+        interactor.EnableRenderOff()
+        interactor.AddObserver("RenderEvent", on_render_request)
+        
+        logger.debug("Enabled deferred rendering")
+        return tick
+    except Exception as e:
+        logger.error(f"Failed to enable deferred rendering: {str(e)}")
+        raise InteractionError(f"Failed to enable deferred rendering: {str(e)}")
+
+def disable_deferred_rendering(interactor: vtk.vtkRenderWindowInteractor) -> None:
+    """
+    Render on demand again after enable_deferred_rendering.
+    
+    Args:
+        interactor: The VTK interactor deferred rendering was enabled on
+        
+    Raises:
+        ValueError: If interactor is invalid
+    """
+    if not isinstance(interactor, vtk.vtkRenderWindowInteractor):
+        raise ValueError("Invalid interactor provided")
+        
+    try:
+        interactor.EnableRenderOn()
+        logger.debug("Disabled deferred rendering")
+    except Exception as e:
+        logger.error(f"Failed to disable deferred rendering: {str(e)}")
+        raise InteractionError(f"Failed to disable deferred rendering: {str(e)}")
+
+def enable_timer_rendering(
+    interactor: vtk.vtkRenderWindowInteractor,
+    frame_rate: float = 60.0
+) -> int:
+    """
+    Drive deferred rendering from a repeating VTK timer.
+    
+    The tick from enable_deferred_rendering runs on a repeating interactor
+    timer. The requested duration is only honoured by interactors that
+    implement it: QVTKRenderWindowInteractor ignores it and fires every
+    10 ms from a single QTimer shared by all VTK timers, so destroying any
+    other timer also stops the render ticks. Embedded in Qt, drive the tick
+    from a QTimer of your own instead.
+    
+    Args:
+        interactor: The VTK interactor to drive
+        frame_rate: Maximum renders per second (default: 60)
+        
+    Returns:
+        The id of the repeating render timer
+        
+    Raises:
+        ValueError: If interactor is invalid or frame_rate is not positive
+    """
+    if not isinstance(interactor, vtk.vtkRenderWindowInteractor):
+        raise ValueError("Invalid interactor provided")
+    if frame_rate <= 0:
+        raise ValueError("Frame rate must be positive")
+        
+    try:
+        tick = enable_deferred_rendering(interactor)
+        timer_id = interactor.CreateRepeatingTimer(max(1, int(1000 / frame_rate)))
+        
+        def on_timer(obj, event):
+            if obj.GetTimerEventId() == timer_id:
+                tick()
+                
+        interactor.AddObserver("TimerEvent", on_timer)
+        
+        logger.debug(f"Enabled timer rendering at {frame_rate} fps")
+        return timer_id
+    except InteractionError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to enable timer rendering: {str(e)}")
+        raise InteractionError(f"Failed to enable timer rendering: {str(e)}")
+
+def disable_timer_rendering(
+    interactor: vtk.vtkRenderWindowInteractor,
+    timer_id: int
+) -> None:
+    """
+    Stop timer-driven rendering and render on demand again.
+    
+    Args:
+        interactor: The VTK interactor timer rendering was enabled on
+        timer_id: The timer id returned by enable_timer_rendering
+        
+    Raises:
+        ValueError: If interactor is invalid
+    """
+    if not isinstance(interactor, vtk.vtkRenderWindowInteractor):
+        raise ValueError("Invalid interactor provided")
+        
+    try:
+        interactor.DestroyTimer(timer_id)
+        disable_deferred_rendering(interactor)
+        logger.debug("Disabled timer rendering")
+    except Exception as e:
+        logger.error(f"Failed to disable timer rendering: {str(e)}")
+        raise InteractionError(f"Failed to disable timer rendering: {str(e)}")
+
 def add_clipping_planes(
     actor: Union[vtkActor, vtkVolume],
     origin: Optional[Tuple[float, float, float]] = None,
-    normals: Optional[List[Tuple[float, float, float]]] = None
-) -> vtk.vtkPlaneCollection:
+    normals: Optional[List[Tuple[float, float, float]]] = None,
+    also_return_complement: bool = False
+) -> Union[vtk.vtkPlaneCollection, Tuple[vtk.vtkPolyData, vtk.vtkPolyData]]:
     """
     Add clipping planes to an actor for better visualization.
     
@@ -63,31 +205,47 @@ def add_clipping_planes(
         actor: The VTK actor or volume to add clipping planes to
         origin: Origin point for the clipping planes (default: (0, 0, 0))
         normals: List of normal vectors for the clipping planes (default: standard axes)
+        also_return_complement: Whether to clip the actor's poly data with
+            filters instead of in the mapper and also return the part that
+            was clipped away. Each plane is clipped once, producing both
+            sides; the actor then renders the kept part. Only supported for
+            poly data actors (default: False)
         
     Returns:
-        The collection of clipping planes
+        The collection of clipping planes, or a (kept, complement) tuple of
+        poly data if also_return_complement is True
         
     Raises:
         ValueError: If actor is invalid or parameters are invalid
     """
     if not isinstance(actor, (vtkActor, vtkVolume)):
         raise ValueError("Invalid actor provided")
+    if also_return_complement and not isinstance(actor, vtkActor):
+        raise ValueError("Complement clipping requires a poly data actor")
         
     try:
-        planes = vtk.vtkPlaneCollection()
-        
         if origin is None:
             origin = (0, 0, 0)
             
         if normals is None:
             normals = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
             
+        # Move the actor's existing planes rather than rebuilding them
+        existing = actor.GetMapper().GetClippingPlanes()
+        if (not also_return_complement and existing is not None
+                and existing.GetNumberOfItems() == len(normals)):
+            return update_clipping_planes(actor, [origin] * len(normals), normals)
+            
+        planes = vtk.vtkPlaneCollection()
         for normal in normals:
             plane = vtk.vtkPlane()
             plane.SetOrigin(*origin)
             plane.SetNormal(*normal)
             planes.AddItem(plane)
             
+        if also_return_complement:
+            return _clip_with_complement(actor, planes)
+            
         if isinstance(actor, vtkActor):
             actor.GetMapper().SetClippingPlanes(planes)
         else:
@@ -99,18 +257,333 @@ def add_clipping_planes(
         logger.error(f"Failed to add clipping planes: {str(e)}")
         raise InteractionError(f"Failed to add clipping planes: {str(e)}")
 
+class ClipPlanes:
+    """
+    Contiguous origin/normal buffers mirroring a vtkPlaneCollection.
+    
+    Origins and normals are kept in (N, 3) float64 arrays, so an update is
+    diffed against the current state in a single vectorized comparison and
+    only the planes that actually moved cross into VTK.
+    """
+    
+    __slots__ = ("planes", "origins", "normals", "_items")
+    
+    def __init__(self, planes: vtk.vtkPlaneCollection):
+        self.planes = planes
+        planes.InitTraversal()
+        self._items = [planes.GetNextItem() for _ in range(planes.GetNumberOfItems())]
+        self.origins = np.array([p.GetOrigin() for p in self._items], dtype=np.float64).reshape(-1, 3)
+        self.normals = np.array([p.GetNormal() for p in self._items], dtype=np.float64).reshape(-1, 3)
+        
+    def update(self, origins, normals) -> int:
+        """
+        Move the planes to new origins and normals.
+        
+        Args:
+            origins: (N, 3) array-like of plane origins, or a single origin
+                shared by every plane
+            normals: (N, 3) array-like of plane normals
+            
+        Returns:
+            The number of planes that changed
+        """
+        origins = np.broadcast_to(np.asarray(origins, dtype=np.float64), self.origins.shape)
+        normals = np.broadcast_to(np.asarray(normals, dtype=np.float64), self.normals.shape)
+        changed = np.flatnonzero(((origins != self.origins) | (normals != self.normals)).any(axis=1))
+        
+        self.origins[changed] = origins[changed]
+        self.normals[changed] = normals[changed]
+        for i in changed.tolist():
+            plane = self._items[i]
+            plane.SetOrigin(*self.origins[i].tolist())
+            plane.SetNormal(*self.normals[i].tolist())
+        return len(changed)
+
+def update_clipping_planes(
+    actor: Union[vtkActor, vtkVolume],
+    origins: List[Tuple[float, float, float]],
+    normals: List[Tuple[float, float, float]]
+) -> vtk.vtkPlaneCollection:
+    """
+    Move an actor's clipping planes in place.
+    
+    The existing vtkPlane objects are updated instead of replaced, so
+    interactive slab scrubbing allocates nothing. A ClipPlanes buffer is
+    kept on the plane collection, so only planes whose origin or normal
+    actually changed are touched.
+    
+    Args:
+        actor: The VTK actor or volume whose clipping planes to update
+        origins: New origin for each plane
+        normals: New normal vector for each plane
+        
+    Returns:
+        The updated collection of clipping planes
+        
+    Raises:
+        ValueError: If actor is invalid or the planes do not match
+    """
+    if not isinstance(actor, (vtkActor, vtkVolume)):
+        raise ValueError("Invalid actor provided")
+        
+    planes = actor.GetMapper().GetClippingPlanes()
+    if planes is None:
+        raise ValueError("Actor has no clipping planes")
+    if not len(origins) == len(normals) == planes.GetNumberOfItems():
+        raise ValueError("Number of origins and normals must match the clipping planes")
+        
+    try:
+        buffers = getattr(planes, "_clip_buffers", None)
+        if buffers is None or len(buffers.origins) != len(normals):
+            buffers = planes._clip_buffers = ClipPlanes(planes)
+        buffers.update(origins, normals)
+        
+        logger.debug("Updated clipping planes in place")
+        return planes
+    except Exception as e:
+        logger.error(f"Failed to update clipping planes: {str(e)}")
+        raise InteractionError(f"Failed to update clipping planes: {str(e)}")
+
+def _clip_with_complement(
+    actor: vtkActor,
+    planes: vtk.vtkPlaneCollection
+) -> Tuple[vtk.vtkPolyData, vtk.vtkPolyData]:
+    """
+    Clip an actor's poly data by a set of planes, keeping both sides.
+    
+    The clippers are chained so each one only sees what the previous planes
+    kept; the pieces each plane cuts away are appended into the complement.
+    
+    Args:
+        actor: The poly data actor to clip
+        planes: The clipping planes
+        
+    Returns:
+        Tuple of (kept, complement) poly data
+    """
+    mapper = actor.GetMapper()
+    if mapper.GetNumberOfInputConnections(0) > 0:
+        upstream = mapper.GetInputConnection(0, 0)
+    else:
+        source = vtk.vtkTrivialProducer()
+        source.SetOutput(mapper.GetInput())
+        upstream = source.GetOutputPort()
+        
+    complement = vtk.vtkAppendPolyData()
+    planes.InitTraversal()
+    for _ in range(planes.GetNumberOfItems()):
+        clipper = vtk.vtkClipPolyData()
+        clipper.SetInputConnection(upstream)
+        clipper.SetClipFunction(planes.GetNextItem())
+        clipper.GenerateClippedOutputOn()
+        complement.AddInputConnection(clipper.GetClippedOutputPort())
+        upstream = clipper.GetOutputPort()
+        
+    complement.Update()
+    mapper.SetInputConnection(upstream)
+    mapper.Update()
+    
+    logger.debug("Clipped actor and generated complement")
+    return mapper.GetInput(), complement.GetOutput()
+
+def _mesh_data(prop: vtk.vtkProp) -> Optional[vtk.vtkDataSet]:
+    """Get the data set a poly data mapper draws for an actor, if any."""
+    mapper = prop.GetMapper() if isinstance(prop, vtkActor) else None
+    if not isinstance(mapper, vtk.vtkPolyDataMapper):
+        return None
+    data = mapper.GetInputDataObject(0, 0)
+    return data if isinstance(data, vtk.vtkDataSet) else None
+
+class _ActorBoundsIndex:
+    """
+    Axis-aligned bounding boxes of pickable actors in one (M, 6) array.
+    
+    A pick ray is tested against every box at once with a vectorized slab
+    test, so the picker only visits the few actors the ray can hit. Only
+    actors drawn by a poly data mapper are indexed, so decorations such as
+    cube axes, whose bounds span the whole scene, do not defeat the cull;
+    every other prop (volumes, image slices, actors with other mappers) is
+    handed to the picker on every pick, as an unculled picker would. The
+    boxes are rebuilt when an actor or its mesh is modified or, for
+    renderer-wide picking, when props are added or removed.
+    
+    Each indexed mesh also gets a vtkCellLocator registered with the
+    picker, so a pick searches the locator tree instead of testing every
+    cell. Locators are kept per mesh and rebuilt with the boxes only for
+    meshes whose data MTime changed.
+    """
+    
+    __slots__ = (
+        "_renderer", "_picker", "_fixed", "actors", "unculled", "_bounds",
+        "_mtime", "_props_mtime", "_locators"
+    )
+    
+    def __init__(
+        self,
+        renderer: vtk.vtkRenderer,
+        picker: vtk.vtkCellPicker,
+        actors: Optional[List[vtkActor]] = None
+    ):
+        self._renderer = renderer
+        self._picker = picker
+        self._locators = {}
+        self._fixed = actors is not None
+        self.actors: List[vtkActor] = []
+        self.unculled: List[vtk.vtkProp] = []
+        if self._fixed:
+            self._split(actors)
+        self._bounds = np.empty((0, 6))
+        self._mtime = -1
+        self._props_mtime = -1
+        
+    def _split(self, props) -> None:
+        """Sort props into indexed meshes and props that are always picked."""
+        self.actors = [p for p in props if _mesh_data(p) is not None]
+        self.unculled = [p for p in props if _mesh_data(p) is None]
+        
+    def refresh(self) -> None:
+        """Rebuild the boxes and cell locators if the scene or a mesh changed."""
+        if not self._fixed:
+            props_mtime = self._renderer.GetViewProps().GetMTime()
+            if props_mtime != self._props_mtime:
+                # Every view prop, so volumes, image slices and actors with
+                # other mappers stay pickable alongside the indexed meshes
+                props = self._renderer.GetViewProps()
+                self._split([props.GetItemAsObject(i) for i in range(props.GetNumberOfItems())])
+                self._props_mtime = props_mtime
+                self._mtime = -1
+        mtime = 0
+        for actor in self.actors:
+            data = _mesh_data(actor)
+            mtime = max(mtime, actor.GetMTime(), data.GetMTime() if data is not None else 0)
+        if mtime == self._mtime:
+            return
+        self._bounds = np.array([a.GetBounds() for a in self.actors], dtype=np.float64).reshape(-1, 6)
+        self._update_locators()
+        self._mtime = mtime
+        
+    def _update_locators(self) -> None:
+        """Register one up-to-date cell locator per indexed mesh with the picker."""
+        locators = {}
+        for actor in self.actors:
+            data = _mesh_data(actor)
+            if data is None or data.GetNumberOfCells() == 0:
+                continue
+            cached = self._locators.get(data)
+            if cached is None or cached[0] != data.GetMTime():
+                locator = vtk.vtkCellLocator()
+                locator.SetDataSet(data)
+                locator.BuildLocator()
+                cached = (data.GetMTime(), locator)
+            locators[data] = cached
+        self._locators = locators
+        self._picker.RemoveAllLocators()
+        for _, locator in locators.values():
+            self._picker.AddLocator(locator)
+        
+    def candidates(self, near: np.ndarray, far: np.ndarray) -> List[vtk.vtkProp]:
+        """Get the props the segment near->far can hit: culled actors plus unindexed props."""
+        self.refresh()
+        lo = self._bounds[:, 0::2]
+        hi = self._bounds[:, 1::2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = 1.0 / (far - near)
+            t1 = (lo - near) * inv
+            t2 = (hi - near) * inv
+        # fmin/fmax drop the NaNs from rays lying in a slab plane
+        t_enter = np.fmax(np.fmin(t1, t2).max(axis=1), 0.0)
+        t_exit = np.fmin(np.fmax(t1, t2).min(axis=1), 1.0)
+        hits = np.flatnonzero(t_enter <= t_exit)
+        return [self.actors[i] for i in hits.tolist()] + self.unculled
+
+class _PickCallback:
+    """
+    Pick observer for LeftButtonPressEvent.
+    
+    A slotted callable with every VTK method it calls per click bound once
+    up front and the ray end points written into a preallocated buffer, so
+    a click does no attribute, closure-cell or global lookups and no
+    validation on the way into VTK. The click ray is first culled against
+    the actor bounds index and the picker is restricted to the actors it
+    can hit.
+    """
+    
+    __slots__ = (
+        "_pick", "_picker", "_renderer", "_callback", "_index", "_ends",
+        "_set_display_point", "_display_to_world", "_get_world_point",
+        "_pick_from_list_on", "_init_pick_list", "_add_pick_list"
+    )
+    
+    def __init__(
+        self,
+        picker: vtk.vtkCellPicker,
+        renderer: vtk.vtkRenderer,
+        callback: callable,
+        index: _ActorBoundsIndex
+    ):
+        self._pick = picker.Pick
+        self._picker = picker
+        self._renderer = renderer
+        self._callback = callback
+        self._index = index
+        self._ends = np.empty((2, 3))
+        self._set_display_point = renderer.SetDisplayPoint
+        self._display_to_world = renderer.DisplayToWorld
+        self._get_world_point = renderer.GetWorldPoint
+        self._pick_from_list_on = picker.PickFromListOn
+        self._init_pick_list = picker.InitializePickList
+        self._add_pick_list = picker.AddPickList
+        
+    def _ray(self, x: float, y: float) -> np.ndarray:
+        """Write the near and far world points under (x, y) into the ray buffer."""
+        ends = self._ends
+        for i in (0, 1):
+            self._set_display_point(x, y, float(i))
+            self._display_to_world()
+            wx, wy, wz, w = self._get_world_point()
+            w = w or 1.0
+            ends[i, 0] = wx / w
+            ends[i, 1] = wy / w
+            ends[i, 2] = wz / w
+        return ends
+        
+    def __call__(self, obj, event):
+        x, y = obj.GetEventPosition()
+        ends = self._ray(x, y)
+        self._pick_from_list_on()
+        self._init_pick_list()
+        add = self._add_pick_list
+        for actor in self._index.candidates(ends[0], ends[1]):
+            add(actor)
+        self._pick(x, y, 0, self._renderer)
+        self._callback(self._picker)
+
 def add_picking(
     interactor: vtk.vtkRenderWindowInteractor,
     renderer: vtk.vtkRenderer,
-    callback: Optional[callable] = None
+    callback: Optional[callable] = None,
+    actors: Optional[List[vtkActor]] = None,
+    tolerance: float = 1e-6
 ) -> vtk.vtkCellPicker:
     """
     Add picking functionality to the scene.
     
+    For each pickable mesh actor a vtkCellLocator is built up front and
+    registered with the picker, so a click searches the locator tree instead
+    of testing every cell of the mesh. Props without a poly data mapper,
+    such as cube axes, get no locator. Each click first culls the actors by
+    bounding box against the pick ray, so only actors the ray crosses are
+    handed to the picker; with a callback the picker's pick list is
+    therefore managed per click, and locators of meshes modified since the
+    last click are rebuilt before picking.
+    
     Args:
         interactor: The VTK interactor to add picking to
         renderer: The VTK renderer to pick from
         callback: Optional callback function to handle pick events
+        actors: Optional list of actors to pick from (default: all actors
+            in the renderer)
+        tolerance: Pick tolerance as a fraction of the render window size
         
     Returns:
         The cell picker instance
@@ -125,14 +598,22 @@ def add_picking(
         
     try:
         picker = vtk.vtkCellPicker()
-        picker.SetTolerance(1e-6)
+        picker.SetTolerance(tolerance)
         
-        if callback:
-            def on_pick(obj, event):
-                picker.Pick(obj.GetEventPosition()[0], obj.GetEventPosition()[1], 0, renderer)
-                callback(picker)
+        if actors is not None:
+            # Restrict picking to the given actors
+            picker.PickFromListOn()
+            for actor in actors:
+                picker.AddPickList(actor)
                 
-            interactor.AddObserver("LeftButtonPressEvent", on_pick)
+        # Build one cell locator per mesh for O(log n) ray intersection
+        index = _ActorBoundsIndex(renderer, picker, actors)
+        index.refresh()
+        
+        if callback:
+            interactor.AddObserver(
+                "LeftButtonPressEvent", _PickCallback(picker, renderer, callback, index)
+            )
             
         logger.debug("Added picking functionality")
         return picker
@@ -5,8 +5,14 @@ Provides functions for loading and processing 3D model files.
 
 import os
 import logging
-from typing import Optional, Tuple, Dict, Any
+import atexit
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, Callable
+import numpy as np
 import vtk
+from vtkmodules.util.numpy_support import vtk_to_numpy
 from vtkmodules.vtkCommonCore import vtkObject
 from vtkmodules.vtkRenderingCore import vtkActor, vtkProperty
 
@@ -17,6 +23,45 @@ class ModelLoadError(Exception):
     """Custom exception for model loading errors."""
     pass
 
+@functools.lru_cache(maxsize=16)
+def _read_polydata(file_path: str, mtime_ns: int, size: int) -> vtk.vtkPolyData:
+    """
+    Parse a model file into poly data once per file version.
+    
+    The modification time and size only key the cache, so an edited file
+    is parsed again. lru_cache keeps its bookkeeping thread-safe for loads
+    running on worker threads.
+    """
+    # Select appropriate reader based on file extension
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".stl":
+        reader = vtk.vtkSTLReader()
+    elif ext == ".obj":
+        reader = vtk.vtkOBJReader()
+    else:
+        raise ModelLoadError(f"Unsupported file format: {ext}")
+        
+    logger.info(f"Loading model from {file_path}")
+    reader.SetFileName(file_path)
+    reader.Update()
+    return reader.GetOutput()
+
+def _load_polydata(file_path: str) -> vtk.vtkPolyData:
+    """
+    Read a model file into poly data, reusing earlier reads of the same file.
+    
+    Args:
+        file_path: Path to the model file
+        
+    Returns:
+        The model's poly data
+        
+    Raises:
+        ModelLoadError: If the file format is not supported
+    """
+    stat = os.stat(file_path)
+    return _read_polydata(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
 def load_model(
     file_path: str,
     color: Optional[Tuple[float, float, float]] = None,
@@ -54,22 +99,12 @@ def load_model(
         raise ValueError("Invalid interpolation method")
         
     try:
-        # Select appropriate reader based on file extension
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext == ".stl":
-            reader = vtk.vtkSTLReader()
-        elif ext == ".obj":
-            reader = vtk.vtkOBJReader()
-        else:
-            raise ModelLoadError(f"Unsupported file format: {ext}")
-            
-        logger.info(f"Loading model from {file_path}")
-        reader.SetFileName(file_path)
-        reader.Update()
+        # Read (or reuse) the mesh
+        polydata = _load_polydata(file_path)
         
         # Create mapper
         mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInputConnection(reader.GetOutputPort())
+        mapper.SetInputData(polydata)
         
         # Create actor
         actor = vtk.vtkActor()
@@ -107,6 +142,66 @@ def load_model(
         logger.error(f"Failed to load model: {str(e)}")
         raise ModelLoadError(f"Failed to load model: {str(e)}")
 
+# Triangles measured between cancellation checks in _mass_properties
+_MASS_CHUNK_CELLS = 1 << 18
+
+def _triangles(polydata: vtk.vtkPolyData) -> np.ndarray:
+    """Get a mesh's polygons as an (M, 3) array of point ids, triangulating if needed."""
+    polys = polydata.GetPolys()
+    if polys.GetNumberOfCells() and np.any(np.diff(vtk_to_numpy(polys.GetOffsetsArray())) != 3):
+        triangulate = vtk.vtkTriangleFilter()
+        triangulate.SetInputData(polydata)
+        triangulate.PassVertsOff()
+        triangulate.PassLinesOff()
+        triangulate.Update()
+        polys = triangulate.GetOutput().GetPolys()
+    return vtk_to_numpy(polys.GetConnectivityArray()).reshape(-1, 3)
+
+def _mass_properties(
+    polydata: vtk.vtkPolyData,
+    cancel_event: Optional[threading.Event] = None
+) -> Optional[Tuple[float, float, Tuple[float, float, float]]]:
+    """
+    Get the surface area, volume and center of mass of a mesh.
+    
+    Areas and signed tetrahedron volumes are summed over chunks of
+    triangles, and cancel_event is checked before every chunk. The results
+    are stored on the poly data together with its MTime and reused until
+    the geometry is modified; cancelled runs are not stored.
+    
+    Args:
+        polydata: The mesh to measure
+        cancel_event: Optional event that stops the measurement once set
+        
+    Returns:
+        Tuple of (surface area, volume, center of mass), or None if
+        cancelled
+    """
+    mtime = polydata.GetMTime()
+    cached = getattr(polydata, "_cached_mass", None)
+    if cached is not None and cached[0] == mtime:
+        return cached[1:]
+        
+    points = _ensure_soa(polydata).astype(np.float64, copy=False)
+    triangles = _triangles(polydata)
+    
+    area = 0.0
+    signed_volume = 0.0
+    for start in range(0, len(triangles), _MASS_CHUNK_CELLS):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        chunk = triangles[start:start + _MASS_CHUNK_CELLS]
+        v0, v1, v2 = points[chunk[:, 0]], points[chunk[:, 1]], points[chunk[:, 2]]
+        cross = np.cross(v1 - v0, v2 - v0)
+        area += 0.5 * float(np.sqrt(np.einsum('ij,ij->i', cross, cross)).sum())
+        signed_volume += float(np.einsum('ij,ij->i', v0, cross).sum())
+        
+    # Unweighted center of mass is the mean of the points
+    center = tuple(points.mean(axis=0).tolist()) if len(points) else (0.0, 0.0, 0.0)
+    
+    polydata._cached_mass = (mtime, area, abs(signed_volume) / 6.0, center)
+    return polydata._cached_mass[1:]
+
 def get_model_info(file_path: str) -> Dict[str, Any]:
     """
     Get information about a 3D model file.
@@ -124,10 +219,8 @@ def get_model_info(file_path: str) -> Dict[str, Any]:
         raise ModelLoadError(f"File not found: {file_path}")
         
     try:
-        # Load the model
-        actor = load_model(file_path)
-        mapper = actor.GetMapper()
-        polydata = mapper.GetInput()
+        # Load the model, sharing the mesh cache with load_model
+        polydata = _load_polydata(file_path)
         
         # Get bounds
         bounds = polydata.GetBounds()
@@ -136,10 +229,8 @@ def get_model_info(file_path: str) -> Dict[str, Any]:
         num_points = polydata.GetNumberOfPoints()
         num_cells = polydata.GetNumberOfCells()
         
-        # Get surface area and volume
-        mass = vtk.vtkMassProperties()
-        mass.SetInputData(polydata)
-        mass.Update()
+        # Get surface area, volume and center of mass
+        surface_area, volume, center_of_mass = _mass_properties(polydata)
         
         info = {
             "file_path": file_path,
@@ -147,9 +238,9 @@ def get_model_info(file_path: str) -> Dict[str, Any]:
             "bounds": bounds,
             "num_points": num_points,
             "num_cells": num_cells,
-            "surface_area": mass.GetSurfaceArea(),
-            "volume": mass.GetVolume(),
-            "center_of_mass": mass.GetCenterOfMass()
+            "surface_area": surface_area,
+            "volume": volume,
+            "center_of_mass": center_of_mass
         }
         
         logger.debug(f"Retrieved model info: {info}")
@@ -159,12 +250,153 @@ def get_model_info(file_path: str) -> Dict[str, Any]:
         logger.error(f"Failed to get model info: {str(e)}")
         raise ModelLoadError(f"Failed to get model info: {str(e)}")
 
-def center_model(actor: vtkActor) -> None:
+# Worker thread for model info queries, created on first use. Parsing
+# and measuring run in NumPy and VTK code that releases the GIL, and the
+# thread shares the mesh cache with load_model, so no file is parsed twice
+_info_executor: Optional[ThreadPoolExecutor] = None
+_info_lock = threading.Lock()
+
+def _shutdown_info_executor() -> None:
+    """Drop queued model info queries and stop the worker thread."""
+    if _info_executor is not None:
+        _info_executor.shutdown(wait=False, cancel_futures=True)
+
+atexit.register(_shutdown_info_executor)
+
+class ModelInfoTask:
+    """
+    Handle for a model info query running on the worker thread.
+    
+    Args:
+        future: Future resolving to the model info dictionary, or None if
+            the query was cancelled
+        cancel_event: Event the worker checks between stages and between
+            chunks of triangles
+    """
+    
+    def __init__(self, future: Future, cancel_event: threading.Event):
+        self.future = future
+        self._cancel_event = cancel_event
+        
+    def cancel(self) -> None:
+        """Cancel the query; a running worker stops at its next check."""
+        self._cancel_event.set()
+        self.future.cancel()
+        
+    def add_done_callback(self, callback: Callable[[Future], None]) -> None:
+        """Call callback with the future once the query finishes."""
+        self.future.add_done_callback(callback)
+        
+    def result(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for and return the model info."""
+        return self.future.result(timeout)
+
+def _model_info_worker(file_path: str, cancel_event: threading.Event) -> Optional[Dict[str, Any]]:
+    """Compute model info on the worker thread, bailing out once cancelled."""
+    if cancel_event.is_set():
+        return None
+    polydata = _load_polydata(file_path)
+    if cancel_event.is_set() or _mass_properties(polydata, cancel_event) is None:
+        return None
+    return get_model_info(file_path)
+
+def get_model_info_async(file_path: str) -> ModelInfoTask:
+    """
+    Get information about a 3D model file without blocking the caller.
+    
+    File parsing and mass properties run on a single worker thread, so the
+    UI thread keeps rendering. Completion callbacks run on the worker
+    thread; GUI code must hand the result back to its own thread.
+    
+    Args:
+        file_path: Path to the model file
+        
+    Returns:
+        Task handle whose future resolves to the get_model_info dictionary
+        
+    Raises:
+        ModelLoadError: If the file does not exist
+    """
+    global _info_executor
+    
+    if not os.path.exists(file_path):
+        raise ModelLoadError(f"File not found: {file_path}")
+        
+    with _info_lock:
+        if _info_executor is None:
+            _info_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-info")
+            
+    cancel_event = threading.Event()
+    future = _info_executor.submit(_model_info_worker, file_path, cancel_event)
+    return ModelInfoTask(future, cancel_event)
+
+def _ensure_soa(polydata: vtk.vtkPolyData) -> np.ndarray:
+    """
+    Get a mesh's points as a contiguous (N, 3) NumPy array.
+    
+    The array wraps the vtkPoints buffer without copying and is stored on the
+    poly data together with its MTime, along with the point bounds, so
+    repeated center/normalize calls reuse both until the mesh is modified.
+    
+    Args:
+        polydata: The mesh whose points to wrap
+        
+    Returns:
+        The (N, 3) array of point coordinates
+    """
+    mtime = polydata.GetMTime()
+    cached = getattr(polydata, "_soa", None)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+        
+    points = polydata.GetPoints()
+    if points is None or points.GetNumberOfPoints() == 0:
+        soa = np.zeros((0, 3))
+        bounds = (np.zeros(3), np.zeros(3))
+    else:
+        soa = vtk_to_numpy(points.GetData()).reshape(-1, 3)
+        bounds = (soa.min(axis=0), soa.max(axis=0))
+    polydata._soa = (mtime, soa, bounds)
+    return soa
+
+def _point_bounds(polydata: vtk.vtkPolyData) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the (min, max) corners of a mesh's points from the cached array."""
+    _ensure_soa(polydata)
+    return polydata._soa[2]
+
+def _bake_transform(
+    mapper: vtk.vtkPolyDataMapper,
+    polydata: vtk.vtkPolyData,
+    transform: vtk.vtkTransform
+) -> None:
+    """
+    Transform a mapper's mesh points once and detach the filter.
+    
+    The transformed copy is set as static input data rather than connected
+    through the filter, so later pipeline updates do not re-run the
+    transform on the CPU.
+    """
+    transform_filter = vtk.vtkTransformPolyDataFilter()
+    transform_filter.SetInputData(polydata)
+    transform_filter.SetTransform(transform)
+    transform_filter.Update()
+    
+    baked = vtk.vtkPolyData()
+    baked.ShallowCopy(transform_filter.GetOutput())
+    mapper.SetInputData(baked)
+
+def center_model(actor: vtkActor, bake: bool = False) -> None:
     """
     Center a model actor at the origin.
     
+    By default only the actor's model matrix is changed: the origin is set to
+    the mesh center and the position to its negation, so the points are not
+    copied, the GPU applies the offset per draw and later scaling happens
+    about the center. Calling it again just overwrites the matrix.
+    
     Args:
         actor: The VTK actor to center
+        bake: Whether to transform the mesh points instead (default: False)
         
     Raises:
         ValueError: If actor is invalid
@@ -177,39 +409,38 @@ def center_model(actor: vtkActor) -> None:
         polydata = mapper.GetInput()
         
         # Get bounds
-        bounds = polydata.GetBounds()
+        lo, hi = _point_bounds(polydata)
         
         # Calculate center
-        center = [
-            (bounds[0] + bounds[1]) / 2,
-            (bounds[2] + bounds[3]) / 2,
-            (bounds[4] + bounds[5]) / 2
-        ]
+        center = ((lo + hi) / 2).tolist()
         
+        if not bake:
+            actor.SetOrigin(*center)
+            actor.SetPosition(-center[0], -center[1], -center[2])
+            logger.debug("Model centered successfully")
+            return
+            
         # Create transform
         transform = vtk.vtkTransform()
         transform.Translate(-center[0], -center[1], -center[2])
         
         # Apply transform
-        transform_filter = vtk.vtkTransformPolyDataFilter()
-        transform_filter.SetInputData(polydata)
-        transform_filter.SetTransform(transform)
-        transform_filter.Update()
-        
-        # Update mapper input
-        mapper.SetInputConnection(transform_filter.GetOutputPort())
+        _bake_transform(mapper, polydata, transform)
         
         logger.debug("Model centered successfully")
     except Exception as e:
         logger.error(f"Failed to center model: {str(e)}")
         raise ModelLoadError(f"Failed to center model: {str(e)}")
 
-def normalize_model(actor: vtkActor) -> None:
+def normalize_model(actor: vtkActor, bake: bool = False) -> None:
     """
     Normalize a model actor to fit within a unit cube.
     
+    By default only the actor's scale is set, so the points are not copied.
+    
     Args:
         actor: The VTK actor to normalize
+        bake: Whether to transform the mesh points instead (default: False)
         
     Raises:
         ValueError: If actor is invalid
@@ -222,27 +453,22 @@ def normalize_model(actor: vtkActor) -> None:
         polydata = mapper.GetInput()
         
         # Get bounds
-        bounds = polydata.GetBounds()
+        lo, hi = _point_bounds(polydata)
         
         # Calculate scale factors
-        scale = max(
-            bounds[1] - bounds[0],
-            bounds[3] - bounds[2],
-            bounds[5] - bounds[4]
-        )
+        scale = float((hi - lo).max())
         
+        if not bake:
+            actor.SetScale(1/scale, 1/scale, 1/scale)
+            logger.debug("Model normalized successfully")
+            return
+            
         # Create transform
         transform = vtk.vtkTransform()
         transform.Scale(1/scale, 1/scale, 1/scale)
         
         # Apply transform
-        transform_filter = vtk.vtkTransformPolyDataFilter()
-        transform_filter.SetInputData(polydata)
-        transform_filter.SetTransform(transform)
-        transform_filter.Update()
-        
-        # Update mapper input
-        mapper.SetInputConnection(transform_filter.GetOutputPort())
+        _bake_transform(mapper, polydata, transform)
         
         logger.debug("Model normalized successfully")
     except Exception as e:
@@ -4,6 +4,7 @@ Provides functions for adding various visualization elements to the 3D scene.
 """
 
 import logging
+from collections import OrderedDict
 from typing import Tuple, Optional, Union
 import vtk
 from vtkmodules.vtkCommonCore import vtkObject
@@ -207,3 +208,145 @@ def add_text_overlay(
     except Exception as e:
         logger.error(f"Failed to add text overlay: {str(e)}")
         raise
+
+class FrameCache:
+    """
+    Reuse rendered frames for camera poses that were already drawn.
+    
+    Each frame is keyed by the quantized camera pose, the window size and
+    the latest redraw time of the renderer's props, so a frame is only
+    reused while the scene itself is unchanged. Overlays drawn by other
+    renderers (e.g. widgets) are part of the cached pixels but not the key.
+    
+    Args:
+        render_window: The VTK render window to cache frames for
+        renderer: The VTK renderer whose camera and props key the cache
+        bucket: Quantization step for camera coordinates
+        max_frames: Maximum number of frames to keep
+    """
+    
+    def __init__(
+        self,
+        render_window: vtk.vtkRenderWindow,
+        renderer: vtk.vtkRenderer,
+        bucket: float = 1e-3,
+        max_frames: int = 16
+    ):
+        self.render_window = render_window
+        self.renderer = renderer
+        self.bucket = bucket
+        self.max_frames = max_frames
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        
+    def _key(self) -> tuple:
+        """Get the cache key for the current camera and scene."""
+        camera = self.renderer.GetActiveCamera()
+        pose = (camera.GetPosition() + camera.GetFocalPoint() + camera.GetViewUp()
+                + (camera.GetViewAngle(), camera.GetParallelScale()))
+        props = self.renderer.GetViewProps()
+        stamp = max((props.GetItemAsObject(i).GetRedrawMTime()
+                     for i in range(props.GetNumberOfItems())), default=0)
+        return (tuple(round(x / self.bucket) for x in pose),
+                tuple(self.render_window.GetSize()),
+                stamp,
+                self.renderer.GetMTime())
+        
+    def capture(self) -> None:
+        """Store the frame currently in the render window under the current key."""
+        width, height = self.render_window.GetSize()
+        frame = vtk.vtkUnsignedCharArray()
+        self.render_window.GetPixelData(0, 0, width - 1, height - 1, 0, frame)
+        
+        key = self._key()
+        self._frames[key] = frame
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+            
+    def render(self) -> bool:
+        """
+        Render the window, reusing a cached frame when the pose matches.
+        
+        Returns:
+            True if a cached frame was shown, False if the scene was rendered
+        """
+        key = self._key()
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            width, height = self.render_window.GetSize()
+            self.render_window.SetPixelData(0, 0, width - 1, height - 1, frame, 0)
+            self.render_window.Frame()
+            self.hits += 1
+            return True
+            
+        self.render_window.Render()
+        self.capture()
+        self.misses += 1
+        return False
+        
+    def clear(self) -> None:
+        """Drop all cached frames."""
+        self._frames.clear()
+
+def install_frame_cache(
+    render_window: vtk.vtkRenderWindow,
+    renderer: vtk.vtkRenderer,
+    bucket: float = 1e-3,
+    max_frames: int = 16
+) -> FrameCache:
+    """
+    Install a frame cache on a render window.
+    
+    The still frame rendered when a camera interaction ends is captured,
+    so later re-renders at that pose (hover, widget activity) can go
+    through FrameCache.render() and skip the render pass. Set the
+    interaction style before installing the cache.
+    
+    Args:
+        render_window: The VTK render window to cache frames for
+        renderer: The VTK renderer whose camera and props key the cache
+        bucket: Quantization step for camera coordinates (default: 1e-3)
+        max_frames: Maximum number of frames to keep (default: 16)
+        
+    Returns:
+        The installed frame cache
+        
+    Raises:
+        ValueError: If render window or renderer is invalid
+    """
+    if not isinstance(render_window, vtk.vtkRenderWindow):
+        raise ValueError("Invalid render window provided")
+    if not isinstance(renderer, vtk.vtkRenderer):
+        raise ValueError("Invalid renderer provided")
+    if bucket <= 0:
+        raise ValueError("Bucket must be positive")
+        
+    try:
+        cache = FrameCache(render_window, renderer, bucket, max_frames)
+        
+        # The style renders the final still frame right after it fires
+        # EndInteractionEvent, so capture on the next render end
+        interactor = render_window.GetInteractor()
+        style = interactor.GetInteractorStyle() if interactor is not None else None
+        if style is not None:
+            pending = [False]
+            
+            def on_end_interaction(obj, event):
+                pending[0] = True
+                
+            def on_render_end(obj, event):
+                if pending[0]:
+                    pending[0] = False
+                    cache.capture()
+                    
+            style.AddObserver("EndInteractionEvent", on_end_interaction)
+            render_window.AddObserver("EndEvent", on_render_end)
+            
+        logger.debug("Installed frame cache")
+        return cache
+    except Exception as e:
+        logger.error(f"Failed to install frame cache: {str(e)}")
+        raise
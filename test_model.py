@@ -3,48 +3,146 @@ Script to test the trained tumor detection model.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 import tensorflow as tf
 from tensorflow.keras.models import load_model
 from config import AI_MODEL_PATH
+from utils.jit import njit, prange, NUMBA_AVAILABLE
+from modules.ai_analysis import AIModelManager
+from train_model import export_tflite
 
-def preprocess_image(image, target_size=(128, 128)):
-    """Preprocess an image for model input."""
-    # Resize image
-    image = cv2.resize(image, target_size)
+def preprocess_image(image, target_size=(128, 128), out=None):
+    """
+    Preprocess an image for model input.
+    
+    The normalized pixels are written straight into out, a float32 buffer of
+    shape (1, height, width, 1) such as one row of a preallocated batch; a
+    new buffer is allocated if it is not given.
+    """
+    if out is None:
+        out = np.empty((1, target_size[1], target_size[0], 1), dtype=np.float32)
     
-    # Convert to grayscale if needed
+    # Convert to grayscale first so only one channel is resized
     if len(image.shape) == 3:
         image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
-    # Normalize pixel values
-    image = image.astype('float32') / 255.0
+    # Resize image
+    image = cv2.resize(image, target_size, interpolation=cv2.INTER_AREA)
     
-    # Add batch and channel dimensions
-    image = np.expand_dims(image, axis=[0, -1])
+    # Normalize pixel values into the output buffer
+    np.multiply(image, np.float32(1 / 255.0), out=out[0, :, :, 0], dtype=np.float32)
     
-    return image
+    return out
 
 def generate_sample_image():
     """Generate a sample image for testing."""
-    # Create a random image
-    image = np.random.randn(128, 128)
+    # Create a random float32 image
+    rng = np.random.default_rng()
+    image = rng.standard_normal((128, 128), dtype=np.float32)
     
     # Add a circular pattern (simulating a tumor)
     center_x = 64
     center_y = 64
     radius = 10
-    y_coords, x_coords = np.ogrid[-center_y:128-center_y, -center_x:128-center_x]
-    mask = x_coords*x_coords + y_coords*y_coords <= radius*radius
-    image[mask] = np.random.normal(2, 0.5, mask.sum())
+    y_coords, x_coords = np.ogrid[:128, :128]
+    mask = (x_coords - center_x)**2 + (y_coords - center_y)**2 <= radius*radius
+    image[mask] = rng.normal(2, 0.5, mask.sum())
     
-    # Normalize to 0-255 range
-    image = ((image - image.min()) * (255 / (image.max() - image.min()))).astype(np.uint8)
+    # Normalize to 0-255 range in place
+    image -= image.min()
+    image *= np.float32(255 / image.max())
+    image = image.astype(np.uint8)
     
     return image
 
-def test_model():
+# Pixel coordinates of the simulated tumor, computed once for every batch
+_yy, _xx = np.ogrid[:128, :128]
+_MASK_Y, _MASK_X = np.nonzero((_xx - 64)**2 + (_yy - 64)**2 <= 10*10)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _gen_batch(out, mask_y, mask_x):
+    """Fill out (N, H, W) uint8 with sample images, one image per thread."""
+    n, h, w = out.shape
+    for k in prange(n):
+        image = np.empty((h, w), dtype=np.float32)
+        for i in range(h):
+            for j in range(w):
+                image[i, j] = np.random.randn()
+        for m in range(mask_y.shape[0]):
+            image[mask_y[m], mask_x[m]] = 2.0 + 0.5 * np.random.randn()
+        
+        # Normalize to 0-255 range
+        lo = image.min()
+        scale = np.float32(255.0) / (image.max() - lo)
+        for i in range(h):
+            for j in range(w):
+                out[k, i, j] = np.uint8((image[i, j] - lo) * scale)
+
+def generate_sample_batch(num_samples):
+    """Generate a batch of sample images as an (N, 128, 128) uint8 array."""
+    if not NUMBA_AVAILABLE:
+        return np.stack([generate_sample_image() for _ in range(num_samples)])
+    out = np.empty((num_samples, 128, 128), dtype=np.uint8)
+    _gen_batch(out, _MASK_Y, _MASK_X)
+    return out
+
+def make_inference_fn(model, image_size=(128, 128)):
+    """Trace the model once for any batch size of preprocessed images."""
+    @tf.function(input_signature=[tf.TensorSpec([None, *image_size, 1], tf.float32)])
+    def infer(x):
+        return model(x, training=False)
+    
+    return infer
+
+def make_int8_inference_fn(tflite_path, batch_size, num_threads=None):
+    """Build an INT8 TFLite interpreter and return a float-in, float-out callable."""
+    # XNNPACK is the interpreter's default CPU delegate and uses VNNI int8
+    # dot products where the CPU supports them
+    interpreter = tf.lite.Interpreter(model_path=tflite_path,
+                                      num_threads=num_threads or os.cpu_count())
+    input_details = interpreter.get_input_details()[0]
+    interpreter.resize_tensor_input(input_details['index'],
+                                    [batch_size, *input_details['shape'][1:]])
+    interpreter.allocate_tensors()
+    
+    # Quantize and dequantize with the tensors' own dtypes, as the app does
+    return lambda x: AIModelManager._run_tflite(interpreter, x)
+
+class Preprocessor:
+    """
+    Stream images through preprocessing into one reused batch buffer.
+    
+    Each pushed image is written into the next row of a preallocated
+    (batch_size, 128, 128, 1) float32 buffer; when the buffer fills, infer
+    runs on the whole batch and the row counter resets, so streaming
+    screening never allocates a new input batch.
+    """
+    
+    def __init__(self, infer, batch_size=32, image_size=(128, 128)):
+        self.infer = infer
+        self.buf = np.empty((batch_size, image_size[1], image_size[0], 1), dtype=np.float32)
+        self.image_size = image_size
+        self.i = 0
+    
+    def push(self, image):
+        """Add an image; return the batch predictions once the batch fills, else None."""
+        preprocess_image(image, self.image_size, out=self.buf[self.i:self.i+1])
+        self.i += 1
+        if self.i < len(self.buf):
+            return None
+        return self.flush()
+    
+    def flush(self):
+        """Run inference on the images pushed so far and reset the batch."""
+        n, self.i = self.i, 0
+        if n == 0:
+            return None
+        # The whole buffer is run so fixed-shape models see one batch size
+        return self.infer(self.buf)[:n]
+
+def test_model(num_samples=8, use_int8=True):
     """Test the trained model."""
     # Load the model
     model_path = os.path.join(AI_MODEL_PATH, 'tumor_detection.h5')
@@ -54,24 +152,43 @@ def test_model():
         return
     
     model = load_model(model_path)
+    if use_int8:
+        # train_model.py exports the INT8 model; export it the same way
+        # if it is missing so both scripts share one calibration
+        tflite_path = os.path.join(AI_MODEL_PATH, 'tumor_detection.tflite')
+        if not os.path.exists(tflite_path):
+            export_tflite(model, tflite_path)
+        infer = make_int8_inference_fn(tflite_path, num_samples)
+    else:
+        keras_infer = make_inference_fn(model)
+        infer = lambda x: keras_infer(tf.constant(x)).numpy()
     
-    # Generate and process a sample image
-    image = generate_sample_image()
-    processed_image = preprocess_image(image)
-    
-    # Make prediction
-    prediction = model.predict(processed_image, verbose=0)
-    confidence = float(prediction[0][0])
+    # Stream the sample images into one batch; predictions come back from
+    # a single inference call once it fills
+    images = generate_sample_batch(num_samples)
+    preprocessor = Preprocessor(infer, batch_size=num_samples)
+    for image in images:
+        predictions = preprocessor.push(image)
+    predictions = predictions[:, 0]
     
-    # Display results
-    print("\nModel Test Results:")
-    print("-" * 20)
-    print(f"Confidence: {confidence:.2f}")
-    print(f"Prediction: {'Tumor Detected' if confidence > 0.5 else 'No Tumor Detected'}")
+    # Write the first sample image as a fast, lossless PNG in the background
+    # while the results are printed; the pool is joined on leaving the block
+    with ThreadPoolExecutor(max_workers=1) as io_pool:
+        saved = io_pool.submit(
+            cv2.imwrite, 'sample_image.png', images[0], [cv2.IMWRITE_PNG_COMPRESSION, 1]
+        )
+        
+        # Display results
+        print("\nModel Test Results:")
+        print("-" * 20)
+        for i, confidence in enumerate(predictions):
+            print(f"Sample {i}: Confidence: {confidence:.2f} - "
+                  f"{'Tumor Detected' if confidence > 0.5 else 'No Tumor Detected'}")
     
-    # Save the sample image
-    cv2.imwrite('sample_image.png', image)
-    print("\nSample image saved as 'sample_image.png'")
+    if saved.result():
+        print("\nSample image saved as 'sample_image.png'")
+    else:
+        print("\nError: Could not save 'sample_image.png'")
 
 if __name__ == "__main__":
-    test_model() 
\ No newline at end of file
+    test_model()
@@ -3,59 +3,32 @@ Tests for the AI analysis module.
 """
 
 import os
+import tempfile
 import unittest
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from modules.ai_analysis import (
-    analyze_dicom,
-    analyze_volume,
-    segment_anatomy,
-    detect_landmarks,
-    AIAnalysisError,
-    # Models
-    create_tumor_detection_model,
-    create_segmentation_model,
-    create_landmark_detection_model,
-    
-    # Data Generation
-    generate_synthetic_data,
-    generate_segmentation_data,
-    generate_landmark_data,
-    
-    # Training
-    train_model,
-    evaluate_model,
-    predict_batch,
-    
-    # Preprocessing
-    normalize_image,
-    resize_image,
-    enhance_image,
-    extract_patches,
-    augment_image
-)
 from config import AI_MODEL_PATH
 import pytest
 
+# The ai_analysis names are imported inside the tests that use them, so
+# collecting this file does not load TensorFlow
+
 class TestAIAnalysis(unittest.TestCase):
     """Test cases for AI analysis functionality."""
     
     def setUp(self):
         """Set up test environment."""
-        self.test_dir = "test_data"
-        if not os.path.exists(self.test_dir):
-            os.makedirs(self.test_dir)
+        # A private directory per test, so parallel workers never share one
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = self._tmp.name
             
     def tearDown(self):
         """Clean up test environment."""
-        # Remove test files
-        for file in os.listdir(self.test_dir):
-            os.remove(os.path.join(self.test_dir, file))
-        os.rmdir(self.test_dir)
+        self._tmp.cleanup()
         
     def test_analyze_dicom(self):
         """Test DICOM analysis functionality."""
+        from modules.ai_analysis import analyze_dicom, AIAnalysisError
+        
         # Create a test image
         image = np.random.rand(128, 128)
         
@@ -69,6 +42,8 @@ class TestAIAnalysis(unittest.TestCase):
             
     def test_analyze_volume(self):
         """Test volume analysis functionality."""
+        from modules.ai_analysis import analyze_volume
+        
         # Create a test volume
         volume = np.random.rand(10, 128, 128)
         
@@ -82,6 +57,8 @@ class TestAIAnalysis(unittest.TestCase):
             
     def test_segment_anatomy(self):
         """Test anatomical segmentation functionality."""
+        from modules.ai_analysis import segment_anatomy, AIAnalysisError
+        
         # Create a test image
         image = np.random.rand(128, 128)
         
@@ -95,6 +72,8 @@ class TestAIAnalysis(unittest.TestCase):
             
     def test_detect_landmarks(self):
         """Test landmark detection functionality."""
+        from modules.ai_analysis import detect_landmarks, AIAnalysisError
+        
         # Create a test image
         image = np.random.rand(128, 128)
         
@@ -108,6 +87,9 @@ class TestAIAnalysis(unittest.TestCase):
             
     def test_model_loading(self):
         """Test AI model loading."""
+        from tensorflow.keras.models import load_model
+        from modules.ai_analysis import AIAnalysisError
+        
         # Test with nonexistent model
         model_path = os.path.join(AI_MODEL_PATH, "nonexistent_model.h5")
         with self.assertRaises(AIAnalysisError):
@@ -125,6 +107,12 @@ def sample_batch():
 
 def test_model_creation():
     """Test model creation functions."""
+    from modules.ai_analysis import (
+        create_tumor_detection_model,
+        create_segmentation_model,
+        create_landmark_detection_model
+    )
+    
     # Test tumor detection model
     tumor_model = create_tumor_detection_model()
     assert tumor_model.input_shape == (None, 128, 128, 1)
@@ -142,26 +130,50 @@ def test_model_creation():
 
 def test_data_generation():
     """Test data generation functions."""
+    from modules.ai_analysis import (
+        generate_synthetic_data,
+        generate_segmentation_data,
+        generate_landmark_data,
+        decode_landmarks
+    )
+    
     # Test synthetic data generation
     X, y = generate_synthetic_data(num_samples=10)
     assert X.shape == (10, 128, 128, 1)
     assert y.shape == (10,)
-    assert np.all(np.isin(y, [0, 1]))
+    assert ((y == 0) | (y == 1)).all()
     
     # Test segmentation data generation
     X, y = generate_segmentation_data(num_samples=10)
     assert X.shape == (10, 128, 128, 1)
     assert y.shape == (10, 128, 128, 1)
-    assert np.all(np.isin(y, [0, 1]))
+    assert ((y == 0) | (y == 1)).all()
     
     # Test landmark data generation
     X, y = generate_landmark_data(num_samples=10)
     assert X.shape == (10, 128, 128, 1)
     assert y.shape == (10, 20)  # 10 landmarks * 2 coordinates
-    assert np.all(y >= 0) and np.all(y <= 1)
+    assert y.min() >= 0 and y.max() <= 1
+    
+    # Test quantized landmark data generation
+    X, y_x, y_y = generate_landmark_data(num_samples=10, quantized=True)
+    assert y_x.shape == y_y.shape == (10, 10)
+    assert y_x.dtype == y_y.dtype == np.int16
+    y = decode_landmarks(y_x, y_y)
+    assert y.shape == (10, 20)
+    assert y.min() >= 0 and y.max() < 1
 
 def test_preprocessing(sample_image):
     """Test preprocessing functions."""
+    from modules.ai_analysis import (
+        normalize_image,
+        resize_image,
+        enhance_image,
+        extract_patches,
+        augment_image,
+        augment_batch
+    )
+    
     # Test normalization
     normalized = normalize_image(sample_image)
     assert np.min(normalized) >= 0
@@ -182,9 +194,21 @@ def test_preprocessing(sample_image):
     # Test augmentation
     augmented = augment_image(sample_image)
     assert augmented.shape == sample_image.shape
+    
+    # Test batch augmentation
+    batch = np.stack([sample_image] * 4)
+    augmented = augment_batch(batch)
+    assert augmented.shape == batch.shape
 
 def test_training_and_evaluation(sample_batch):
     """Test training and evaluation functions."""
+    from modules.ai_analysis import (
+        create_tumor_detection_model,
+        train_model,
+        evaluate_model,
+        predict_batch
+    )
+    
     # Create a simple model for testing
     model = create_tumor_detection_model()
     
@@ -216,10 +240,17 @@ def test_training_and_evaluation(sample_batch):
     # Test prediction
     predictions = predict_batch(model, X_train)
     assert predictions.shape == (10, 1)
-    assert np.all(np.isin(predictions, [0, 1]))
+    assert np.logical_or(predictions == 0, predictions == 1).all()
 
 def test_error_handling():
     """Test error handling in various functions."""
+    from modules.ai_analysis import (
+        create_tumor_detection_model,
+        normalize_image,
+        extract_patches,
+        predict_batch
+    )
+    
     # Test invalid input shapes
     with pytest.raises(ValueError):
         normalize_image(np.random.rand(64, 64))  # Missing channel dimension
@@ -233,5 +264,83 @@ def test_error_handling():
     with pytest.raises(ValueError):
         predict_batch(model, np.random.rand(10, 64, 64))  # Missing channel dimension
 
+class _ConstantMeanManager:
+    """Model manager stand-in whose model returns each image's mean."""
+    
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batch_sizes = []
+        
+    def _input_dtype(self, model_name):
+        import tensorflow as tf
+        return tf.float32
+        
+    def _input_shape(self, model_name):
+        return (8, 8, 1)
+        
+    def preprocess_image(self, image, target_size, dtype, normalize=False):
+        from modules.ai_analysis import AIModelManager
+        return AIModelManager.preprocess_image(image, target_size, dtype, normalize)
+        
+    def _run(self, model_name, batch):
+        if self.fail:
+            raise RuntimeError("inference failed")
+        self.batch_sizes.append(int(batch.shape[0]))
+        return batch.numpy().mean(axis=(1, 2))
+
+def test_request_batcher_coalesces():
+    """Concurrent requests are run as one padded batch."""
+    from modules.ai_analysis.utils.analysis import _RequestBatcher
+    
+    manager = _ConstantMeanManager()
+    batcher = _RequestBatcher(manager, "mean", max_batch=3, max_delay=5.0)
+    try:
+        futures = [batcher.submit(np.full((16, 16), 51.0 * k)) for k in range(3)]
+        results = [future.result(timeout=10) for future in futures]
+    finally:
+        batcher.close()
+        
+    # One call, padded up to the next profiled batch size
+    assert manager.batch_sizes == [8]
+    np.testing.assert_allclose(np.ravel(results), [0.0, 0.2, 0.4], atol=1e-6)
+
+def test_request_batcher_propagates_errors():
+    """A failed batch fails every request in it."""
+    from modules.ai_analysis.utils.analysis import _RequestBatcher
+    
+    batcher = _RequestBatcher(_ConstantMeanManager(fail=True), "mean", max_delay=0.0)
+    try:
+        future = batcher.submit(np.zeros((16, 16)))
+        with pytest.raises(RuntimeError):
+            future.result(timeout=10)
+    finally:
+        batcher.close()
+
+def test_request_batcher_shutdown():
+    """close() stops the thread and release_models frees the manager."""
+    import gc
+    import weakref
+    from modules.ai_analysis import AIAnalysisError
+    from modules.ai_analysis.utils.analysis import (
+        _RequestBatcher, get_model_manager, release_models
+    )
+    
+    batcher = _RequestBatcher(_ConstantMeanManager(), "mean")
+    batcher.close()
+    assert not batcher._thread.is_alive()
+    with pytest.raises(AIAnalysisError):
+        batcher.submit(np.zeros((16, 16)))
+        
+    manager = get_model_manager()
+    manager._batchers["mean"] = _RequestBatcher(manager, "mean")
+    thread = manager._batchers["mean"]._thread
+    manager_ref = weakref.ref(manager)
+    del manager
+    
+    release_models()
+    gc.collect()
+    assert not thread.is_alive()
+    assert manager_ref() is None
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Tests for the annotation module.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+from modules import annotation
+from modules.annotation import measure_distance, pairwise_distances
+
+class TestAnnotation(unittest.TestCase):
+    """Test cases for annotation functionality."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        rng = np.random.default_rng(0)
+        self.points = rng.standard_normal((12, 3))
+        self.expected = np.linalg.norm(
+            self.points[:, None, :] - self.points[None, :, :], axis=-1
+        )
+        
+    def test_measure_distance(self):
+        """Test distance between two points."""
+        self.assertAlmostEqual(measure_distance((0, 0, 0), (1, 2, 2)), 3.0)
+        
+    def test_pairwise_distances_kernel(self):
+        """Test the JIT kernel path against np.linalg.norm."""
+        with mock.patch.object(annotation, "NUMBA_AVAILABLE", True):
+            distances = pairwise_distances(self.points)
+        np.testing.assert_allclose(distances, self.expected, atol=1e-12)
+        
+    def test_pairwise_distances_numpy(self):
+        """Test the NumPy path against np.linalg.norm."""
+        with mock.patch.object(annotation, "NUMBA_AVAILABLE", False):
+            distances = pairwise_distances(self.points)
+        np.testing.assert_allclose(distances, self.expected, atol=1e-12)
+        
+    def test_pairwise_distances_invalid_shape(self):
+        """Test that non-(N, 3) input is rejected."""
+        with self.assertRaises(ValueError):
+            pairwise_distances(np.zeros((6, 2)))
+        with self.assertRaises(ValueError):
+            pairwise_distances(np.zeros(9))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@
 Tests for the model loader module.
 """
 
-import os
+import tempfile
 import unittest
 import numpy as np
 from vtk import vtkActor
@@ -19,16 +19,13 @@ class TestModelLoader(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.test_dir = "test_data"
-        if not os.path.exists(self.test_dir):
-            os.makedirs(self.test_dir)
+        # A private directory per test, so parallel workers never share one
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = self._tmp.name
             
     def tearDown(self):
         """Clean up test environment."""
-        # Remove test files
-        for file in os.listdir(self.test_dir):
-            os.remove(os.path.join(self.test_dir, file))
-        os.rmdir(self.test_dir)
+        self._tmp.cleanup()
         
     def test_load_model(self):
         """Test model loading functionality."""
@@ -7,9 +7,9 @@ import os
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
 import matplotlib.pyplot as plt
 from config import AI_MODEL_PATH
+from modules.ai_analysis.utils.preprocessing import augment_batch
 
 def create_model():
     """Create a simple CNN model."""
@@ -34,9 +34,10 @@ def create_model():
     ])
     
     model.compile(
-        optimizer='adam',
+        optimizer=tf.keras.optimizers.Adam(),
         loss='binary_crossentropy',
-        metrics=['accuracy']
+        metrics=['accuracy'],
+        jit_compile=True
     )
     
     return model
@@ -44,7 +45,7 @@ def create_model():
 def generate_synthetic_data(num_samples=1000):
     """Generate synthetic data for training."""
     # Create synthetic images (random noise with different patterns)
-    X = np.random.randn(num_samples, 128, 128, 1)
+    X = np.random.standard_normal((num_samples, 128, 128, 1)).astype(np.float32)
     
     # Create synthetic labels (random binary classification)
     y = np.random.randint(0, 2, num_samples)
@@ -58,10 +59,29 @@ def generate_synthetic_data(num_samples=1000):
             radius = np.random.randint(5, 15)
             y_coords, x_coords = np.ogrid[-center_y:128-center_y, -center_x:128-center_x]
             mask = x_coords*x_coords + y_coords*y_coords <= radius*radius
-            X[i, mask] = np.random.normal(2, 0.5, mask.sum())
+            X[i, mask, 0] = np.random.normal(2, 0.5, mask.sum())
     
     return X, y
 
+def export_tflite(model, output_path, num_calibration_samples=200):
+    """Export a Keras model as a fully INT8-quantized TFLite model."""
+    # Calibrate activation ranges on data drawn from the training distribution
+    X_calib, _ = generate_synthetic_data(num_calibration_samples)
+    
+    def representative_dataset():
+        for i in range(num_calibration_samples):
+            yield [X_calib[i:i+1]]
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+
 def train_model():
     """Train the model on synthetic data."""
     # Create model
@@ -71,19 +91,36 @@ def train_model():
     X_train, y_train = generate_synthetic_data(1000)
     X_val, y_val = generate_synthetic_data(200)
     
-    # Data augmentation
-    datagen = ImageDataGenerator(
-        rotation_range=20,
-        width_shift_range=0.2,
-        height_shift_range=0.2,
-        horizontal_flip=True,
-        fill_mode='nearest'
+    # Data augmentation, run on whole batches inside the tf.data pipeline
+    # so it overlaps with training instead of blocking on the Python thread
+    def augment(x, y):
+        return augment_batch(
+            x,
+            rotation_range=(-20, 20),
+            shift_range=(-0.2, 0.2),
+            zoom_range=(1, 1),
+            flip_vertical=False,
+            brightness_range=(1, 1),
+            fill_mode='nearest'
+        ), y
+    
+    train_ds = (
+        tf.data.Dataset.from_tensor_slices((X_train, y_train))
+        .shuffle(1024)
+        .batch(32)
+        .map(augment, num_parallel_calls=tf.data.AUTOTUNE)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    val_ds = (
+        tf.data.Dataset.from_tensor_slices((X_val, y_val))
+        .batch(32)
+        .prefetch(tf.data.AUTOTUNE)
     )
     
     # Train the model
     history = model.fit(
-        datagen.flow(X_train, y_train, batch_size=32),
-        validation_data=(X_val, y_val),
+        train_ds,
+        validation_data=val_ds,
         epochs=10,
         callbacks=[
             tf.keras.callbacks.EarlyStopping(
@@ -121,8 +158,12 @@ def train_model():
         os.makedirs(AI_MODEL_PATH)
     model.save(os.path.join(AI_MODEL_PATH, 'tumor_detection.h5'))
     
+    # Export the INT8 model used for CPU inference
+    export_tflite(model, os.path.join(AI_MODEL_PATH, 'tumor_detection.tflite'))
+    
     print("Model trained and saved successfully!")
     print(f"Model saved to: {os.path.join(AI_MODEL_PATH, 'tumor_detection.h5')}")
+    print(f"INT8 model saved to: {os.path.join(AI_MODEL_PATH, 'tumor_detection.tflite')}")
 
 if __name__ == "__main__":
     train_model() 
\ No newline at end of file
@@ -7,9 +7,9 @@ import logging
 from typing import Optional
 from PyQt5.QtWidgets import (
     QMainWindow, QFileDialog, QAction, QVBoxLayout, QWidget, 
-    QLabel, QPushButton, QProgressDialog, QMessageBox
+    QLabel, QPushButton, QProgressBar, QMessageBox
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import QTimer, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QKeySequence
 from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
 import vtk
@@ -18,12 +18,13 @@ from config import (
     SUPPORTED_MEDICAL_FORMATS, DEFAULT_BACKGROUND_COLOR,
     DEFAULT_AXES_COLOR, DEFAULT_BOUNDING_BOX_COLOR
 )
-from modules.model_loader import load_model
-from modules.dicom_loader import load_dicom
-from modules.visualization import add_axes, add_bounding_box, add_lighting
-from modules.interaction import set_interaction_style
+from modules.model_loader import load_model, get_model_info_async
+from modules.dicom_loader import load_dicom, get_dicom_array
+from modules.visualization import add_axes, add_bounding_box, add_lighting, add_text_overlay
+from modules.interaction import (
+    set_interaction_style, enable_deferred_rendering, disable_deferred_rendering
+)
 from modules.annotation import create_annotation
-from modules.ai_analysis import analyze_dicom
 from modules.cloud_integration import (
     upload_to_s3, upload_to_firebase, CloudUploadError,
     initialize_cloud_services
@@ -32,14 +33,90 @@ from modules.cloud_integration import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+class AnalyzeTask(QRunnable):
+    """
+    Run AI analysis of a DICOM slice on a thread pool worker.
+    
+    The slice is a private copy taken on the GUI thread, so the worker
+    never touches the cached DICOM reader the renderer is drawing from,
+    and analyze_dicom normalizes raw intensities as part of its fused
+    preprocessing. The result text is passed to emit, a signal's emit
+    method, which queues it back to the GUI thread.
+    """
+    
+    def __init__(self, file_path: str, image, emit):
+        super().__init__()
+        self.file_path = file_path
+        self.image = image
+        self.emit = emit
+        
+    def run(self):
+        # Imported here so window startup does not load TensorFlow
+        from modules.ai_analysis import analyze_dicom
+        
+        try:
+            result = analyze_dicom(self.image, normalize=True)
+        except Exception as e:
+            logger.error(f"AI analysis failed: {str(e)}")
+            result = f"AI analysis failed: {str(e)}"
+        self.emit(self.file_path, result)
+
+def is_dicom_file(file_path: str) -> bool:
+    """Check whether a file is opened with the DICOM loader."""
+    return file_path.lower().endswith(('.dcm', '.nii', '.nii.gz'))
+
+class LoadTask(QRunnable):
+    """
+    Read a 3D model or DICOM file on a thread pool worker.
+    
+    The loaders only build VTK pipeline objects, so they can run off the GUI
+    thread; the loaded actor or volume is passed to emit, a signal's emit
+    method, and is added to the renderer on the GUI thread. Failures are
+    passed to emit_error with the error message.
+    """
+    
+    def __init__(self, file_path: str, emit, emit_error):
+        super().__init__()
+        self.file_path = file_path
+        self.emit = emit
+        self.emit_error = emit_error
+        
+    def run(self):
+        try:
+            if is_dicom_file(self.file_path):
+                prop = load_dicom(self.file_path)
+            else:
+                prop = load_model(self.file_path)
+        except Exception as e:
+            logger.error(f"Error loading file: {str(e)}")
+            self.emit_error(self.file_path, str(e))
+            return
+        self.emit(self.file_path, prop)
+
 class MainWindow(QMainWindow):
     """Main window class for the Medical 3D Viewer application."""
     
+    # Emitted from a worker thread when model info for the current file is ready
+    model_info_ready = pyqtSignal(str, dict)
+    
+    # Emitted from a worker thread when AI analysis of a DICOM finishes
+    analysis_ready = pyqtSignal(str, str)
+    
+    # Emitted from a worker thread when a file has been loaded or failed to load
+    file_loaded = pyqtSignal(str, object)
+    file_load_failed = pyqtSignal(str, str)
+    
     def __init__(self):
         super().__init__()
+        self.model_info_task = None
+        self.payload_prop = None
+        self.info_overlay = None
+        self.model_info_ready.connect(self.show_model_info)
+        self.analysis_ready.connect(self.show_analysis_result)
+        self.file_loaded.connect(self._on_loaded)
+        self.file_load_failed.connect(self._on_load_failed)
         self.setup_ui()
         self.setup_actions()
-        self.setup_shortcuts()
         self.current_file: Optional[str] = None
         
         # Initialize cloud services
@@ -87,20 +164,36 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Ready")
         layout.addWidget(self.status_label)
 
-        # Start VTK
+        # Busy indicator, animated by Qt while background work runs
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumHeight(12)
+        self.busy_indicator.setTextVisible(False)
+        self.busy_indicator.hide()
+        layout.addWidget(self.busy_indicator)
+
+        # Start VTK; interaction renders are coalesced onto a 60 Hz timer.
+        # The tick runs on our own QTimer because the Qt interactor ignores
+        # VTK timer durations and shares one QTimer between all VTK timers.
         self.interactor.Initialize()
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(1000 // 60)
+        self.render_timer.timeout.connect(enable_deferred_rendering(self.interactor))
+        self.render_timer.start()
         self.show()
 
     def setup_actions(self):
-        """Set up menu actions."""
+        """Set up menu actions and their keyboard shortcuts."""
         # File Menu
         file_menu = self.menuBar().addMenu("File")
         
         open_action = QAction("Open File", self)
+        open_action.setShortcut(QKeySequence.Open)
         open_action.triggered.connect(self.load_3d_file)
         file_menu.addAction(open_action)
         
         save_action = QAction("Save View", self)
+        save_action.setShortcut(QKeySequence.Save)
         save_action.triggered.connect(self.save_view)
         file_menu.addAction(save_action)
         
@@ -114,14 +207,17 @@ class MainWindow(QMainWindow):
         view_menu = self.menuBar().addMenu("View")
         
         reset_camera_action = QAction("Reset Camera", self)
+        reset_camera_action.setShortcut("R")
         reset_camera_action.triggered.connect(self.reset_camera)
         view_menu.addAction(reset_camera_action)
         
         toggle_axes_action = QAction("Toggle Axes", self)
+        toggle_axes_action.setShortcut("A")
         toggle_axes_action.triggered.connect(self.toggle_axes)
         view_menu.addAction(toggle_axes_action)
         
         toggle_bounding_box_action = QAction("Toggle Bounding Box", self)
+        toggle_bounding_box_action.setShortcut("B")
         toggle_bounding_box_action.triggered.connect(self.toggle_bounding_box)
         view_menu.addAction(toggle_bounding_box_action)
 
@@ -136,35 +232,6 @@ class MainWindow(QMainWindow):
         upload_firebase_action.triggered.connect(self.upload_firebase)
         upload_menu.addAction(upload_firebase_action)
 
-    def setup_shortcuts(self):
-        """Set up keyboard shortcuts."""
-        # File shortcuts
-        open_shortcut = QAction("Open", self)
-        open_shortcut.setShortcut(QKeySequence.Open)
-        open_shortcut.triggered.connect(self.load_3d_file)
-        self.addAction(open_shortcut)
-        
-        save_shortcut = QAction("Save", self)
-        save_shortcut.setShortcut(QKeySequence.Save)
-        save_shortcut.triggered.connect(self.save_view)
-        self.addAction(save_shortcut)
-        
-        # View shortcuts
-        reset_camera_shortcut = QAction("Reset Camera", self)
-        reset_camera_shortcut.setShortcut("R")
-        reset_camera_shortcut.triggered.connect(self.reset_camera)
-        self.addAction(reset_camera_shortcut)
-        
-        toggle_axes_shortcut = QAction("Toggle Axes", self)
-        toggle_axes_shortcut.setShortcut("A")
-        toggle_axes_shortcut.triggered.connect(self.toggle_axes)
-        self.addAction(toggle_axes_shortcut)
-        
-        toggle_bounding_box_shortcut = QAction("Toggle Bounding Box", self)
-        toggle_bounding_box_shortcut.setShortcut("B")
-        toggle_bounding_box_shortcut.triggered.connect(self.toggle_bounding_box)
-        self.addAction(toggle_bounding_box_shortcut)
-
     def load_3d_file(self):
         """Open and display a 3D model or DICOM file."""
         options = QFileDialog.Options()
@@ -180,54 +247,108 @@ class MainWindow(QMainWindow):
 
         if file_path:
             self.current_file = file_path
-            self.show_loading_dialog("Loading file...")
-            
-            try:
-                if file_path.lower().endswith(('.dcm', '.nii', '.nii.gz')):
-                    self.display_dicom(file_path)
-                else:
-                    self.display_3d_model(file_path)
-            except Exception as e:
-                logger.error(f"Error loading file: {str(e)}")
-                QMessageBox.critical(
-                    self,
-                    "Error",
-                    f"Failed to load file: {str(e)}"
-                )
-            finally:
-                self.hide_loading_dialog()
+            self.set_busy("Loading file...")
+            QThreadPool.globalInstance().start(
+                LoadTask(file_path, self.file_loaded.emit, self.file_load_failed.emit)
+            )
 
-    def display_3d_model(self, file_path: str):
-        """Load and display STL/OBJ models."""
-        try:
-            actor = load_model(file_path)
-            self.renderer.RemoveAllViewProps()
-            self.axes_actor = add_axes(self.interactor, color=DEFAULT_AXES_COLOR)
-            self.bounding_box_actor = add_bounding_box(self.renderer, color=DEFAULT_BOUNDING_BOX_COLOR)
-            self.renderer.AddActor(actor)
-            self.renderer.ResetCamera()
-            self.vtk_widget.GetRenderWindow().Render()
-            self.status_label.setText("Model Loaded Successfully")
-        except Exception as e:
-            raise Exception(f"Failed to load 3D model: {str(e)}")
+    def _on_loaded(self, file_path: str, prop):
+        """Show a file loaded by a LoadTask if it is still the current file."""
+        if file_path != self.current_file:
+            return
+        self.clear_busy()
+        if is_dicom_file(file_path):
+            self.show_dicom(file_path, prop)
+        else:
+            self.show_3d_model(file_path, prop)
+
+    def _on_load_failed(self, file_path: str, message: str):
+        """Report a failed LoadTask if it is still the current file."""
+        if file_path != self.current_file:
+            return
+        self.clear_busy()
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to load file: {message}"
+        )
 
-    def display_dicom(self, file_path: str):
-        """Load and display DICOM images."""
+    def show_3d_model(self, file_path: str, actor):
+        """Display a loaded STL/OBJ model actor."""
+        self.set_payload(actor)
+        self.status_label.setText("Model Loaded Successfully")
+        
+        # Compute model info in the background
+        if self.model_info_task is not None:
+            self.model_info_task.cancel()
+        self.model_info_task = get_model_info_async(file_path)
+        self.model_info_task.add_done_callback(
+            lambda future: self.on_model_info_done(file_path, future)
+        )
+
+    def show_dicom(self, file_path: str, volume):
+        """Display a loaded DICOM volume."""
+        self.set_payload(volume)
+        self.status_label.setText("DICOM Loaded Successfully - Running AI analysis...")
+
+        # Copy the middle axial slice here, on the thread that owns the
+        # reader, and run AI Analysis on it in the background
         try:
-            volume = load_dicom(file_path)
-            self.renderer.RemoveAllViewProps()
-            self.axes_actor = add_axes(self.interactor, color=DEFAULT_AXES_COLOR)
-            self.bounding_box_actor = add_bounding_box(self.renderer, color=DEFAULT_BOUNDING_BOX_COLOR)
-            self.renderer.AddVolume(volume)
-            self.renderer.ResetCamera()
-            self.vtk_widget.GetRenderWindow().Render()
-            self.status_label.setText("DICOM Loaded Successfully")
+            voxels = get_dicom_array(file_path)
+            image = voxels[voxels.shape[0] // 2].copy()
+        except Exception as e:
+            logger.error(f"AI analysis failed: {str(e)}")
+            self.status_label.setText(f"AI analysis failed: {str(e)}")
+            return
+        QThreadPool.globalInstance().start(
+            AnalyzeTask(file_path, image, self.analysis_ready.emit)
+        )
 
-            # Run AI Analysis
-            result = analyze_dicom(file_path)
+    def show_analysis_result(self, file_path: str, result: str):
+        """Show an AI analysis result if its DICOM is still displayed."""
+        if file_path == self.current_file:
             self.status_label.setText(result)
-        except Exception as e:
-            raise Exception(f"Failed to load DICOM: {str(e)}")
+
+    def set_payload(self, prop):
+        """
+        Show a loaded model actor or volume in place of the previous one.
+        
+        The axes widget, bounding box and lights created in setup_ui stay in
+        the scene; only the payload prop is swapped and the bounding box is
+        fitted to it.
+        """
+        if self.payload_prop is not None:
+            self.renderer.RemoveViewProp(self.payload_prop)
+        if self.info_overlay is not None:
+            self.info_overlay.SetVisibility(False)
+        self.payload_prop = prop
+        self.renderer.AddViewProp(prop)
+        self.bounding_box_actor.SetBounds(prop.GetBounds())
+        self.renderer.ResetCamera()
+        self.vtk_widget.GetRenderWindow().Render()
+
+    def on_model_info_done(self, file_path: str, future):
+        """Forward finished model info to the GUI thread."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        info = future.result()
+        if info is not None:
+            self.model_info_ready.emit(file_path, info)
+
+    def show_model_info(self, file_path: str, info: dict):
+        """Show model info as a text overlay if the model is still displayed."""
+        if file_path != self.current_file:
+            return
+        text = (
+            f"Points: {info['num_points']}  Cells: {info['num_cells']}\n"
+            f"Surface area: {info['surface_area']:.2f}  Volume: {info['volume']:.2f}"
+        )
+        if self.info_overlay is None:
+            self.info_overlay = add_text_overlay(self.renderer, text, position=(0.02, 0.02))
+        else:
+            self.info_overlay.SetInput(text)
+            self.info_overlay.SetVisibility(True)
+        self.vtk_widget.GetRenderWindow().Render()
 
     def upload_s3(self):
         """Upload selected file to AWS S3."""
@@ -240,7 +361,7 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            self.show_loading_dialog("Uploading to S3...")
+            self.set_busy("Uploading to S3...")
             url = upload_to_s3(self.current_file)
             QMessageBox.information(
                 self,
@@ -254,7 +375,7 @@ class MainWindow(QMainWindow):
                 f"Failed to upload to S3: {str(e)}"
             )
         finally:
-            self.hide_loading_dialog()
+            self.clear_busy()
 
     def upload_firebase(self):
         """Upload selected file to Firebase."""
@@ -267,7 +388,7 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            self.show_loading_dialog("Uploading to Firebase...")
+            self.set_busy("Uploading to Firebase...")
             url = upload_to_firebase(self.current_file)
             QMessageBox.information(
                 self,
@@ -281,7 +402,7 @@ class MainWindow(QMainWindow):
                 f"Failed to upload to Firebase: {str(e)}"
             )
         finally:
-            self.hide_loading_dialog()
+            self.clear_busy()
 
     def save_view(self):
         """Save the current view as an image."""
@@ -304,7 +425,7 @@ class MainWindow(QMainWindow):
 
         if file_path:
             try:
-                self.show_loading_dialog("Saving view...")
+                self.set_busy("Saving view...")
                 # TODO: Implement view saving functionality
                 self.status_label.setText("View Saved Successfully")
             except Exception as e:
@@ -314,7 +435,7 @@ class MainWindow(QMainWindow):
                     f"Failed to save view: {str(e)}"
                 )
             finally:
-                self.hide_loading_dialog()
+                self.clear_busy()
 
     def reset_camera(self):
         """Reset the camera to its default position."""
@@ -333,13 +454,21 @@ class MainWindow(QMainWindow):
             self.bounding_box_actor.SetVisibility(not self.bounding_box_actor.GetVisibility())
             self.vtk_widget.GetRenderWindow().Render()
 
-    def show_loading_dialog(self, message: str):
-        """Show a loading dialog with the given message."""
-        self.loading_dialog = QProgressDialog(message, None, 0, 0, self)
-        self.loading_dialog.setWindowModality(Qt.WindowModal)
-        self.loading_dialog.show()
-
-    def hide_loading_dialog(self):
-        """Hide the loading dialog."""
-        if hasattr(self, 'loading_dialog'):
-            self.loading_dialog.close()
+    def set_busy(self, message: str):
+        """Show a message with the busy indicator running."""
+        self.idle_status = self.status_label.text()
+        self.busy_status = message
+        self.status_label.setText(message)
+        self.busy_indicator.show()
+
+    def clear_busy(self):
+        """Stop the busy indicator, restoring the status unless it was replaced."""
+        self.busy_indicator.hide()
+        if self.status_label.text() == getattr(self, 'busy_status', None):
+            self.status_label.setText(self.idle_status)
+
+    def closeEvent(self, event):
+        """Stop the render timer before the window closes."""
+        self.render_timer.stop()
+        disable_deferred_rendering(self.interactor)
+        super().closeEvent(event)
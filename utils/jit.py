@@ -0,0 +1,21 @@
+"""
+JIT compilation helpers for the Medical 3D Viewer application.
+
+Numba is an optional dependency. When it is not installed, ``njit`` is a
+no-op decorator and ``prange`` is ``range``, so callers should check
+``NUMBA_AVAILABLE`` and prefer a NumPy path when kernels would otherwise
+run as plain Python.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
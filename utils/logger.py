@@ -3,48 +3,81 @@ Logging utility module for the Medical 3D Viewer application.
 """
 
 import os
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Optional
 from config import LOG_LEVEL, LOG_FILE
 
+# Records are queued by the calling thread and written by one background
+# listener, so logging never blocks on file I/O
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_queue_handler = QueueHandler(_log_queue)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+def _start_listener() -> None:
+    """Create the file and console handlers and start the queue listener once."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        
+        # Create formatters
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        console_formatter = logging.Formatter(
+            '%(levelname)s: %(message)s'
+        )
+        
+        # Create file handler
+        log_dir = os.path.dirname(LOG_FILE)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=10*1024*1024,  # 10MB
+            backupCount=5
+        )
+        file_handler.setFormatter(file_formatter)
+        
+        # Create console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(console_formatter)
+        
+        _listener = QueueListener(
+            _log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        
+        # Flush queued records on exit
+        atexit.register(_listener.stop)
+
 def setup_logger(name: str) -> logging.Logger:
     """
     Set up a logger with file and console handlers.
     
+    The logger only gets a QueueHandler; the file and console handlers run
+    on a shared background listener thread.
+    
     Args:
         name: Name of the logger
-        
+    
     Returns:
         Configured logger instance
     """
+    _start_listener()
+    
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, LOG_LEVEL))
     
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
-    
-    # Create file handler
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    file_handler = RotatingFileHandler(
-        LOG_FILE,
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(file_formatter)
-    
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Add the queue handler to the logger once
+    if _queue_handler not in logger.handlers:
+        logger.addHandler(_queue_handler)
     
     return logger
 
@@ -54,8 +87,8 @@ def get_logger(name: str) -> logging.Logger:
     
     Args:
         name: Name of the logger
-        
+    
     Returns:
         Logger instance
     """
-    return logging.getLogger(name) 
\ No newline at end of file
+    return logging.getLogger(name)